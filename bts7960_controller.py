@@ -9,10 +9,24 @@ Hardware requirements:
 - Only RPWM controlled via GPIO for speed
 
 Migrated to lgpio for compatibility with Raspberry Pi kernel 6.6+
+
+PWM backends:
+- "lgpio"    (default) software-timed PWM via lgpio.tx_pwm
+- "pwm-gpio" kernel pwm-gpio driver via /sys/class/pwm/pwmchipN
+             (needs e.g. dtoverlay=pwm-gpio,gpio=18 in config.txt);
+             falls back to lgpio if the sysfs node is absent
+- "pigpio"   SoC hardware PWM peripheral via pigpio.hardware_PWM
+             (GPIO12/13/18/19 only; needs the pigpiod daemon running,
+             e.g. `sudo pigpiod -s1`; not available on Pi 5)
 """
 
+import asyncio
 import lgpio
-import time
+import logging
+import os
+import threading
+
+log = logging.getLogger(__name__)
 
 
 class BTS7960Controller:
@@ -30,18 +44,48 @@ class BTS7960Controller:
     - LPWM  -> GND (tied LOW)
     """
     
-    def __init__(self, rpwm_pin=18, pwm_freq=10000):
+    SYSFS_PWM_DIR = "/sys/class/pwm"
+    HARDWARE_PWM_PINS = (12, 13, 18, 19)
+    KICK_START_S = 1.0  # Time at full speed when starting from 0
+    
+    def __init__(self, rpwm_pin=18, pwm_freq=10000, backend="lgpio", pwmchip=0, pwm_channel=0):
         """
         Initialize BTS7960 controller with lgpio.
         
         Args:
             rpwm_pin: GPIO pin for RPWM (default: 18)
             pwm_freq: PWM frequency in Hz (default: 10000 - maximum lgpio supports, minimizes audible noise)
+            backend: "lgpio" (default), "pwm-gpio" for the kernel pwm-gpio driver,
+                     or "pigpio" for the hardware PWM peripheral
+            pwmchip: pwmchip number used by the "pwm-gpio" backend (default: 0)
+            pwm_channel: PWM channel on that pwmchip (default: 0)
         """
         self.rpwm_pin = rpwm_pin
         self.pwm_freq = pwm_freq
         self.chip = None
         self.current_speed = 0  # Track current speed for kick-start logic
+        self._kick_pending = None  # Timer/token for a running kick-start
+        self._pwm_lock = threading.Lock()
+        self._open = False  # True from successful setup until cleanup()
+        
+        if backend not in ("lgpio", "pwm-gpio", "pigpio"):
+            raise ValueError(f"Unknown PWM backend: {backend}")
+        
+        if backend == "pigpio":
+            self._setup_pigpio()
+            self.backend = "pigpio"
+            self._open = True
+            return
+        
+        if backend == "pwm-gpio":
+            chip_dir = os.path.join(self.SYSFS_PWM_DIR, f"pwmchip{pwmchip}")
+            if os.path.isdir(chip_dir):
+                self._setup_sysfs_pwm(chip_dir, pwm_channel)
+                self.backend = "pwm-gpio"
+                self._open = True
+                return
+            log.warning("%s not found, falling back to lgpio soft-PWM", chip_dir)
+        self.backend = "lgpio"
         
         # Open GPIO chip
         try:
@@ -67,6 +111,112 @@ class BTS7960Controller:
         # lgpio uses frequency and duty cycle (0-100)
         # Start with 0% duty cycle (fans off)
         lgpio.tx_pwm(self.chip, self.rpwm_pin, self.pwm_freq, 0)
+        self._open = True
+    
+    def _setup_sysfs_pwm(self, chip_dir, channel):
+        """Export a kernel PWM channel and start it at 0% duty cycle."""
+        self._pwmchip_dir = chip_dir
+        self._pwm_channel = channel
+        self._pwm_dir = os.path.join(chip_dir, f"pwm{channel}")
+        self._period_ns = 1_000_000_000 // self.pwm_freq
+        
+        try:
+            if not os.path.isdir(self._pwm_dir):
+                self._sysfs_write(os.path.join(chip_dir, "export"), channel)
+            # Period first: duty_cycle may never exceed it
+            self._sysfs_write(os.path.join(self._pwm_dir, "period"), self._period_ns)
+            self._sysfs_write(os.path.join(self._pwm_dir, "duty_cycle"), 0)
+            self._sysfs_write(os.path.join(self._pwm_dir, "enable"), 1)
+        except OSError as e:
+            raise RuntimeError(
+                f"Failed to setup PWM channel {channel} on {chip_dir}.\n"
+                f"You may need write access to {self.SYSFS_PWM_DIR}.\n"
+                f"Original error: {e}"
+            )
+    
+    def _setup_pigpio(self):
+        """Connect to pigpiod and start hardware PWM at 0% duty cycle."""
+        if self.rpwm_pin not in self.HARDWARE_PWM_PINS:
+            raise ValueError(
+                f"GPIO {self.rpwm_pin} has no hardware PWM. "
+                f"Use one of {self.HARDWARE_PWM_PINS} with the pigpio backend."
+            )
+        
+        import pigpio  # Optional dependency, only needed for this backend
+        
+        self.pi = pigpio.pi()
+        if not self.pi.connected:
+            raise RuntimeError(
+                "Failed to connect to pigpiod. Start it with: sudo pigpiod -s1"
+            )
+        self.pi.hardware_PWM(self.rpwm_pin, self.pwm_freq, 0)
+    
+    @staticmethod
+    def _sysfs_write(path, value):
+        with open(path, "w") as f:
+            f.write(str(value))
+    
+    def _pwm_write(self, duty):
+        """Output a duty cycle (0-99 percent) on the active backend."""
+        if self.backend == "pwm-gpio":
+            self._sysfs_write(os.path.join(self._pwm_dir, "duty_cycle"),
+                              self._period_ns * duty // 100)
+        elif self.backend == "pigpio":
+            # pigpio hardware duty cycle is 0-1,000,000
+            self.pi.hardware_PWM(self.rpwm_pin, self.pwm_freq, duty * 10000)
+        else:
+            lgpio.tx_pwm(self.chip, self.rpwm_pin, self.pwm_freq, duty)
+    
+    @staticmethod
+    def _clamp_speed(speed):
+        """Clamp a requested speed to the valid 0-99 range (100 is capped to 99)."""
+        return max(0, min(99, speed))
+    
+    def _cancel_kick_start(self):
+        """Cancel a pending kick-start completion. Caller holds _pwm_lock."""
+        if isinstance(self._kick_pending, threading.Timer):
+            self._kick_pending.cancel()
+        self._kick_pending = None
+    
+    def _apply_speed(self, speed):
+        """
+        Write a new speed, starting a kick-start if spinning up from 0.
+        Caller holds _pwm_lock.
+        
+        Returns:
+            True if a kick-start was started and the caller must finish it
+        """
+        # Duty is already what was asked for (or will be, once a running
+        # kick-start ends): skip the redundant PWM write
+        if speed == self.current_speed:
+            return False
+        
+        kick_start = False
+        if speed == 0:
+            self._cancel_kick_start()
+            self._pwm_write(0)
+        elif self._kick_pending is not None:
+            # Kick-start already running: it will finish at the new speed
+            pass
+        elif self.current_speed == 0:
+            # Kick-start logic: run at full speed, drop to desired speed later
+            self._pwm_write(99)
+            kick_start = True
+        else:
+            # Set PWM duty cycle on RPWM to desired speed
+            self._pwm_write(speed)
+        
+        # Update current speed tracker
+        self.current_speed = speed
+        return kick_start
+    
+    def _finish_kick_start(self, token):
+        """End a kick-start by dropping to the most recently requested speed."""
+        with self._pwm_lock:
+            # Ignore a kick-start that was cancelled while waiting for the lock
+            if self._kick_pending is token:
+                self._kick_pending = None
+                self._pwm_write(self.current_speed)
     
     def set_speed(self, speed):
         """
@@ -74,37 +224,80 @@ class BTS7960Controller:
         
         When transitioning from 0 speed to any non-zero speed, briefly run
         at full speed (99%) for 1 second to help fans start smoothly.
+        Returns immediately; a background timer applies the requested
+        speed when the kick-start ends. Speeds set during the kick-start
+        take effect when it ends; stop() cancels it.
         
         Args:
             speed: Integer value 0-99 representing speed percentage
                    (values >= 100 are capped to 99)
         """
-        # Cap speed at 99 if 100 or greater is provided
-        if speed >= 100:
-            speed = 99
+        speed = self._clamp_speed(speed)
+        
+        with self._pwm_lock:
+            if self._apply_speed(speed):
+                timer = threading.Timer(self.KICK_START_S, lambda: self._finish_kick_start(timer))
+                timer.daemon = True
+                self._kick_pending = timer
+                timer.start()
+    
+    async def set_speed_async(self, speed):
+        """
+        Coroutine version of set_speed() for asyncio callers.
         
-        # Clamp to valid range 0-99
-        speed = max(0, min(99, speed))
+        Awaits the kick-start instead of using a timer thread.
         
-        # Kick-start logic: if transitioning from 0 to non-zero speed
-        if self.current_speed == 0 and speed > 0:
-            # Run at full speed for 1 second
-            lgpio.tx_pwm(self.chip, self.rpwm_pin, self.pwm_freq, 99)
-            time.sleep(1)
+        Args:
+            speed: Integer value 0-99 representing speed percentage
+                   (values >= 100 are capped to 99)
+        """
+        speed = self._clamp_speed(speed)
         
-        # Set PWM duty cycle on RPWM to desired speed
-        lgpio.tx_pwm(self.chip, self.rpwm_pin, self.pwm_freq, speed)
+        with self._pwm_lock:
+            token = object() if self._apply_speed(speed) else None
+            if token is not None:
+                self._kick_pending = token
         
-        # Update current speed tracker
-        self.current_speed = speed
+        if token is not None:
+            try:
+                await asyncio.sleep(self.KICK_START_S)
+            finally:
+                # Also on cancellation: never leave the fans stuck at kick duty
+                self._finish_kick_start(token)
     
     def stop(self):
-        """Stop the fans (set speed to 0)."""
-        lgpio.tx_pwm(self.chip, self.rpwm_pin, self.pwm_freq, 0)
-        self.current_speed = 0
+        """Stop the fans (set speed to 0). No-op after cleanup()."""
+        with self._pwm_lock:
+            if self._open:
+                self._apply_speed(0)
     
     def cleanup(self):
-        """Clean up GPIO resources."""
+        """Clean up GPIO resources. Safe to call more than once."""
+        with self._pwm_lock:
+            if not self._open:
+                return
+            self._open = False
+            self._cancel_kick_start()
+        
+        if self.backend == "pwm-gpio":
+            try:
+                self._pwm_write(0)
+                self._sysfs_write(os.path.join(self._pwm_dir, "enable"), 0)
+                self._sysfs_write(os.path.join(self._pwmchip_dir, "unexport"), self._pwm_channel)
+            except OSError:
+                pass
+            return
+        
+        if self.backend == "pigpio":
+            try:
+                self.pi.hardware_PWM(self.rpwm_pin, 0, 0)
+                self.pi.stop()
+            except Exception:  # pigpio.error, or a dropped daemon connection
+                pass
+            finally:
+                self.pi = None
+            return
+        
         try:
             # Stop PWM
             lgpio.tx_pwm(self.chip, self.rpwm_pin, self.pwm_freq, 0)
@@ -112,8 +305,10 @@ class BTS7960Controller:
             lgpio.gpio_free(self.chip, self.rpwm_pin)
             # Close the chip
             lgpio.gpiochip_close(self.chip)
-        except:
+        except (lgpio.error, OSError):
             pass
+        finally:
+            self.chip = None
     
     def __enter__(self):
         """Context manager entry."""
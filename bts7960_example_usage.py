@@ -3,57 +3,153 @@
 BTS7960 Fan Controller - Interactive CLI
 """
 
-import time
+import asyncio
+import logging
+import os
+import sys
 from bts7960_controller import BTS7960Controller
 
 
-def main():
+# Stop the fans if nobody has entered a command for this many seconds
+# (e.g. 15 * 60). None, the default, leaves the fans running until told otherwise
+IDLE_TIMEOUT_S = None
+
+
+class StdinLines:
+    """
+    Read stdin line by line without blocking the event loop.
+
+    Reads the file descriptor with os.read() and splits lines itself:
+    sys.stdin.readline() would pull several pasted lines into Python's own
+    buffer, where add_reader() cannot see them until more input arrives.
+    """
+
+    def __init__(self):
+        self._fd = sys.stdin.fileno()
+        self._buffer = b''
+        self._eof = False
+
+    async def _wait_readable(self):
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+
+        def on_readable():
+            if not readable.done():
+                readable.set_result(None)
+
+        loop.add_reader(self._fd, on_readable)
+        try:
+            await readable
+        finally:
+            loop.remove_reader(self._fd)
+
+    async def read_line(self, prompt):
+        """
+        Print a prompt and wait for one line.
+
+        Returns:
+            The line read (including newline), or '' on end-of-file
+        """
+        print(prompt, end='', flush=True)
+        while b'\n' not in self._buffer and not self._eof:
+            await self._wait_readable()
+            chunk = os.read(self._fd, 4096)
+            if not chunk:
+                self._eof = True
+            self._buffer += chunk
+
+        line, newline, self._buffer = self._buffer.partition(b'\n')
+        return (line + newline).decode(errors='replace')
+
+
+async def watchdog(controller, activity):
+    """
+    Stop the fans if no command arrives within IDLE_TIMEOUT_S (only started
+    when IDLE_TIMEOUT_S is set).
+
+    Args:
+        controller: BTS7960Controller being driven by the CLI
+        activity: asyncio.Event set by the CLI whenever a command is entered
+    """
+    while True:
+        try:
+            await asyncio.wait_for(activity.wait(), timeout=IDLE_TIMEOUT_S)
+            activity.clear()
+        except asyncio.TimeoutError:
+            if controller.current_speed > 0:
+                print(f"\n\nNo input for {IDLE_TIMEOUT_S:g} s - stopping fans (watchdog)")
+                controller.stop()
+
+
+async def main():
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    if not sys.stdin.isatty():
+        print("BTS7960 interactive control needs a terminal (stdin is not a TTY)")
+        return
+
     # Use context manager for automatic cleanup
     with BTS7960Controller() as controller:
         print("BTS7960 Fan Controller - Interactive Control")
         print("=" * 50)
         print("Enter fan speed (0-100) or 'q' to quit")
         print("=" * 50)
-        
+
+        stdin = StdinLines()
+        activity = asyncio.Event()
+        watchdog_task = None
+        if IDLE_TIMEOUT_S is not None:
+            watchdog_task = asyncio.create_task(watchdog(controller, activity))
+
         while True:
             try:
                 # Get user input
-                user_input = input("\nEnter fan speed (0-100) or 'q' to quit: ").strip()
-                
+                line = await stdin.read_line("\nEnter fan speed (0-100) or 'q' to quit: ")
+                activity.set()
+
+                # Treat end-of-file (terminal closed) like quit
+                if not line:
+                    print("\nInput closed. Stopping fans and exiting...")
+                    controller.stop()
+                    break
+
+                user_input = line.strip()
+
                 # Check for quit command
                 if user_input.lower() == 'q':
                     print("\nStopping fans and exiting...")
                     controller.stop()
                     break
-                
+
                 # Validate and convert input
                 try:
                     speed = int(user_input)
                 except ValueError:
                     print(f"Error: '{user_input}' is not a valid integer. Please enter a number between 0 and 100.")
                     continue
-                
+
                 # Check range
                 if speed < 0 or speed > 100:
                     print(f"Error: {speed} is out of range. Please enter a value between 0 and 100.")
                     continue
-                
+
                 # Set the speed
                 controller.set_speed(speed)
                 actual_speed = min(speed, 99)  # Controller caps at 99
                 print(f"✓ Fan speed set to {actual_speed}%")
-                
-            except KeyboardInterrupt:
+
+            except asyncio.CancelledError:
+                # asyncio.run() cancels the main task on Ctrl+C
                 print("\n\nInterrupted! Stopping fans and exiting...")
                 controller.stop()
                 break
             except Exception as e:
                 print(f"Unexpected error: {e}")
                 continue
-        
+
+        if watchdog_task is not None:
+            watchdog_task.cancel()
         print("Goodbye!")
 
 
 if __name__ == "__main__":
-    main()
-
+    asyncio.run(main())
@@ -7,62 +7,143 @@ Creates orange (warm) and red (hot) versions by replacing blue water colors.
 from PIL import Image
 import os
 
-def replace_blue_with_color(input_path, output_path, target_color):
+try:
+    import numpy as np
+except ImportError:  # Fall back to a pure-Python loop over the raw bytes
+    np = None
+
+def load_and_mask(input_path):
     """
-    Replace blue-ish pixels in the image with a target color.
+    Load an image and find the blue-ish water pixels to recolor.
     
     Args:
         input_path: Path to input image
-        output_path: Path to save output image
-        target_color: RGB tuple for replacement color (e.g., (255, 136, 0) for orange)
+    
+    Returns:
+        Tuple (arr, mask, blue): the RGBA pixels as an (H, W, 4) uint8
+        array, a boolean (H, W) mask of pixels to replace, and the (H, W)
+        blue channel (0-255) used as the replacement intensity.
     """
     # Open the image
     img = Image.open(input_path)
     img = img.convert('RGBA')  # Ensure RGBA mode
     
-    # Get pixel data
-    pixels = img.load()
     width, height = img.size
-    
-    print(f"Processing {input_path} -> {output_path}")
+    print(f"Loaded {input_path}")
     print(f"Image size: {width}x{height}")
+    
+    if np is None:
+        return _load_and_mask_bytes(img)
+    
+    # Work on the whole image at once as an (H, W, 4) array
+    arr = np.array(img, dtype=np.uint8)
+    r, g, b, a = arr[..., 0], arr[..., 1], arr[..., 2], arr[..., 3]
+    
+    # Select blue-ish pixels (blue component is dominant).
+    # We want to replace light blue water, so check for:
+    # - Alpha is not fully transparent
+    # - Blue component is higher than red and green
+    # - Pixel is not too dark (not black/gray)
+    # Compares are combined in place so only two (H, W) bool buffers exist
+    mask = np.greater(a, 50)
+    tmp = np.empty_like(mask)
+    for lhs, rhs in ((b, r), (b, g), (b, 100)):
+        np.greater(lhs, rhs, out=tmp)
+        mask &= tmp
+    
+    # Use the blue component as the brightness/intensity to preserve
+    return arr, mask, b
+
+def _load_and_mask_bytes(img):
+    """
+    load_and_mask() without numpy: works on the flat RGBA byte buffer.
+    
+    Returns:
+        Tuple (arr, mask, blue): arr is (size, bytearray), mask is the list
+        of byte offsets of pixels to replace, blue their blue components.
+    """
+    buf = bytearray(img.tobytes())
+    mask = []
+    blue = []
+    for i in range(0, len(buf), 4):
+        r, g, b, a = buf[i], buf[i + 1], buf[i + 2], buf[i + 3]
+        if a > 50 and b > r and b > g and b > 100:
+            mask.append(i)
+            blue.append(b)
+    return (img.size, buf), mask, blue
+
+def _apply_color_bytes(arr, mask, blue, target_color):
+    """apply_color() without numpy. Returns the recolored RGBA image."""
+    size, buf = arr
+    out = bytearray(buf)
+    lut_r, lut_g, lut_b = (
+        [int(c * (v / 255.0)) for v in range(256)] for c in target_color
+    )
+    for i, b in zip(mask, blue):
+        out[i] = lut_r[b]
+        out[i + 1] = lut_g[b]
+        out[i + 2] = lut_b[b]
+    return Image.frombytes('RGBA', size, bytes(out))
+
+def color_lut(channel_value):
+    """
+    Build a 256-entry table mapping blue intensity to a scaled channel value.
+    
+    Args:
+        channel_value: Target color component (0-255)
+    
+    Returns:
+        uint8 array where lut[b] == int(channel_value * b / 255)
+    """
+    return (channel_value * (np.arange(256) / 255.0)).astype(np.uint8)
+
+def apply_color(arr, mask, blue, target_color, output_path):
+    """
+    Write a recolored copy of a masked image.
+    
+    Args:
+        arr: RGBA pixel array from load_and_mask (not modified)
+        mask: Boolean mask of pixels to replace
+        blue: Blue channel from load_and_mask
+        target_color: RGB tuple for replacement color (e.g., (255, 136, 0) for orange)
+        output_path: Path to save output image
+    """
+    print(f"Writing {output_path}")
     print(f"Target color: RGB{target_color}")
     
-    # Count pixels changed
-    changed_count = 0
-    
-    # Iterate through all pixels
-    for y in range(height):
-        for x in range(width):
-            r, g, b, a = pixels[x, y]
-            
-            # Check if pixel is blue-ish (blue component is dominant)
-            # We want to replace light blue water, so check for:
-            # - Blue component is higher than red and green
-            # - Pixel is not too dark (not black/gray)
-            # - Alpha is not fully transparent
-            if a > 50:  # Not transparent
-                # Check if it's a shade of blue or cyan
-                # Blue should be higher than red, and reasonably bright
-                if b > r and b > g and b > 100:
-                    # Calculate the brightness/intensity to preserve
-                    # Use the blue component as the reference
-                    intensity = b / 255.0
-                    
-                    # Apply the target color with the same intensity
-                    new_r = int(target_color[0] * intensity)
-                    new_g = int(target_color[1] * intensity)
-                    new_b = int(target_color[2] * intensity)
-                    
-                    pixels[x, y] = (new_r, new_g, new_b, a)
-                    changed_count += 1
-    
-    print(f"Changed {changed_count} pixels")
+    if np is None:
+        _apply_color_bytes(arr, mask, blue, target_color).save(output_path)
+        print(f"Changed {len(mask)} pixels")
+        print(f"Saved to {output_path}\n")
+        return
+    
+    # Apply the target color with the same intensity: one (256, 3) table
+    # gathered over the whole image, then blended in where the mask is set
+    lut = np.stack([color_lut(c) for c in target_color], axis=-1)
+    new_rgb = lut[blue]
+    
+    # Writes mutate the array, so each output gets its own copy
+    out = arr.copy()
+    out[..., :3] = np.where(mask[..., None], new_rgb, arr[..., :3])
+    
+    print(f"Changed {int(mask.sum())} pixels")
     
     # Save the result
-    img.save(output_path)
+    Image.fromarray(out, 'RGBA').save(output_path)
     print(f"Saved to {output_path}\n")
 
+def replace_blue_with_color(input_path, output_path, target_color):
+    """
+    Replace blue-ish pixels in the image with a target color.
+    
+    Args:
+        input_path: Path to input image
+        output_path: Path to save output image
+        target_color: RGB tuple for replacement color (e.g., (255, 136, 0) for orange)
+    """
+    arr, mask, blue = load_and_mask(input_path)
+    apply_color(arr, mask, blue, target_color, output_path)
+
 def main():
     # Define paths
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -81,11 +162,15 @@ def main():
     ORANGE = (255, 136, 0)  # #FF8800
     RED = (255, 51, 51)     # #FF3333
     
+    # Decode and mask the source image once, shared by both variants
+    arr, mask, blue = load_and_mask(input_file)
+    print()
+    
     # Create warm version (orange water)
-    replace_blue_with_color(input_file, warm_file, ORANGE)
+    apply_color(arr, mask, blue, ORANGE, warm_file)
     
     # Create hot version (red water)
-    replace_blue_with_color(input_file, hot_file, RED)
+    apply_color(arr, mask, blue, RED, hot_file)
     
     print("✅ Successfully created colored reservoir images!")
     print(f"   - {warm_file}")
@@ -4,10 +4,16 @@ DS18B20 Temperature Sensor Reader
 A basic class for reading temperatures from DS18B20 sensors on the 1-Wire bus.
 """
 
+import glob
+import logging
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from w1thermsensor import W1ThermSensor, Sensor
 
+log = logging.getLogger(__name__)
+
 
 class DS18B20Reader:
     """
@@ -16,33 +22,64 @@ class DS18B20Reader:
     Automatically configures all discovered sensors to 10-bit resolution
     when sensors are detected or refreshed. This ensures consistent
     behavior for all sensors on the bus.
+    
+    When the kernel w1_therm driver exposes therm_bulk_read, all sensors
+    convert in parallel (one conversion delay per sweep instead of one per
+    sensor). Otherwise sensors are read concurrently from a small thread
+    pool so their conversion waits overlap.
+    
+    Callers that read on a fixed cadence can call start_conversion() right
+    after a read, so the next read collects an already finished conversion
+    instead of waiting for one.
     """
     
+    BULK_READ_GLOB = str(W1ThermSensor.BASE_DIRECTORY / "w1_bus_master*" / "therm_bulk_read")
+    BULK_READ_TIMEOUT_S = 1.0    # 12-bit conversion is 750 ms worst case
+    BULK_READ_POLL_S = 0.01
+    PIPELINE_MAX_AGE_S = 10.0    # Older started conversions are re-triggered
+    MAX_READ_WORKERS = 8
+    SLAVE_PREFIX = "%x-" % Sensor.DS18B20.value  # Device directories are 28-<id>
+    
     def __init__(self):
         """Initialize the DS18B20 reader and discover available sensors."""
         self.sensors: List[W1ThermSensor] = []
+        self._by_id: Dict[str, W1ThermSensor] = {}
+        self._bulk_read_paths: List[str] = sorted(glob.glob(self.BULK_READ_GLOB))
+        self._pool: Optional[ThreadPoolExecutor] = None  # Created on first fallback read
+        self._conversion_started: Optional[float] = None  # monotonic time of start_conversion()
         self._discover_sensors()
     
     def _discover_sensors(self) -> None:
         """
         Discover all available DS18B20 sensors on the bus.
-        Automatically sets all discovered sensors to 10-bit resolution.
+        
+        Sensors already known are kept as-is; only newly connected sensors
+        are created and set to 10-bit resolution.
         """
         try:
-            self.sensors = W1ThermSensor.get_available_sensors([Sensor.DS18B20])
-            # Automatically set all discovered sensors to 10-bit resolution
-            self._auto_set_resolution()
+            present = [name[len(self.SLAVE_PREFIX):]
+                       for name in os.listdir(W1ThermSensor.BASE_DIRECTORY)
+                       if name.startswith(self.SLAVE_PREFIX)]
+            added = [W1ThermSensor(Sensor.DS18B20, sensor_id)
+                     for sensor_id in present if sensor_id not in self._by_id]
+            added_by_id = {sensor.id: sensor for sensor in added}
+            self.sensors = [self._by_id.get(sensor_id) or added_by_id[sensor_id]
+                            for sensor_id in present]
+            self._by_id = {sensor.id: sensor for sensor in self.sensors}
+            # Automatically set newly discovered sensors to 10-bit resolution
+            self._auto_set_resolution(added)
         except Exception as e:
-            print(f"Warning: Error discovering sensors: {e}")
+            log.warning("Error discovering sensors: %s", e)
             self.sensors = []
+            self._by_id = {}
     
-    def _auto_set_resolution(self) -> None:
+    def _auto_set_resolution(self, sensors: List[W1ThermSensor]) -> None:
         """
-        Automatically set all discovered sensors to 10-bit resolution.
+        Automatically set the given sensors to 10-bit resolution.
         This ensures future devices are always configured correctly.
         Fails silently if resolution cannot be set (e.g., permission issues).
         """
-        for sensor in self.sensors:
+        for sensor in sensors:
             try:
                 sensor.set_resolution(10)
             except Exception as e:
@@ -67,13 +104,94 @@ class DS18B20Reader:
             Dictionary mapping sensor addresses to temperatures (Celsius).
             Returns None for sensors that fail to read.
         """
+        if self._bulk_read_paths:
+            try:
+                return self._bulk_read_temperatures()
+            except OSError as e:
+                log.warning("Bulk read failed, falling back to per-sensor reads: %s", e)
+                self._bulk_read_paths = []
+        
+        if len(self.sensors) < 2:
+            return {sensor.id: self._read_sensor(sensor) for sensor in self.sensors}
+        
+        # Each read blocks in file I/O for the conversion, so threads overlap the waits
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.MAX_READ_WORKERS,
+                                            thread_name_prefix="ds18b20")
+        futures = [(sensor.id, self._pool.submit(self._read_sensor, sensor))
+                   for sensor in self.sensors]
+        return {sensor_id: future.result() for sensor_id, future in futures}
+    
+    @staticmethod
+    def _read_sensor(sensor: W1ThermSensor) -> Optional[float]:
+        """Read one sensor, returning None (and logging the error) on failure."""
+        try:
+            return sensor.get_temperature()
+        except Exception as e:
+            log.error("Error reading sensor %s: %s", sensor.id, e)
+            return None
+    
+    def start_conversion(self) -> bool:
+        """
+        Start a bulk conversion on every sensor without waiting for it.
+        
+        The next read_all_temperatures() returns this conversion's results
+        (if it is no older than PIPELINE_MAX_AGE_S) instead of starting
+        and waiting for a new one.
+        
+        Returns:
+            True if a conversion was started, False if bulk reads are unavailable
+        """
+        if not self._bulk_read_paths:
+            return False
+        try:
+            self._trigger_bulk_read()
+        except OSError as e:
+            log.warning("Bulk read failed, falling back to per-sensor reads: %s", e)
+            self._bulk_read_paths = []
+            return False
+        self._conversion_started = time.monotonic()
+        return True
+    
+    def _trigger_bulk_read(self) -> None:
+        """Start a simultaneous conversion on every bus master."""
+        for path in self._bulk_read_paths:
+            with open(path, "w") as f:
+                f.write("trigger")
+    
+    def _bulk_read_temperatures(self) -> Dict[str, Optional[float]]:
+        """
+        Start a simultaneous conversion on every bus master (unless
+        start_conversion() already did), wait for it once, then collect
+        each sensor's result.
+        
+        Raises:
+            OSError if the bulk read interface cannot be used
+        """
+        started, self._conversion_started = self._conversion_started, None
+        if started is None or time.monotonic() - started > self.PIPELINE_MAX_AGE_S:
+            self._trigger_bulk_read()
+        
+        # therm_bulk_read reads -1 while any conversion is still in progress
+        deadline = time.monotonic() + self.BULK_READ_TIMEOUT_S
+        for path in self._bulk_read_paths:
+            while True:
+                with open(path) as f:
+                    if f.read().strip() != "-1":
+                        break
+                if time.monotonic() > deadline:
+                    raise OSError(f"Timed out waiting for {path}")
+                time.sleep(self.BULK_READ_POLL_S)
+        
         results = {}
         for sensor in self.sensors:
+            # The per-device temperature file returns the bulk result (millidegrees C)
+            temperature_path = os.path.join(os.path.dirname(sensor.sensorpath), "temperature")
             try:
-                temperature = sensor.get_temperature()
-                results[sensor.id] = temperature
-            except Exception as e:
-                print(f"Error reading sensor {sensor.id}: {e}")
+                with open(temperature_path) as f:
+                    results[sensor.id] = int(f.read()) / 1000.0
+            except (OSError, ValueError) as e:
+                log.error("Error reading sensor %s: %s", sensor.id, e)
                 results[sensor.id] = None
         return results
     
@@ -87,20 +205,21 @@ class DS18B20Reader:
         Returns:
             Temperature in Celsius, or None if read fails
         """
-        for sensor in self.sensors:
-            if sensor.id == sensor_id:
-                try:
-                    return sensor.get_temperature()
-                except Exception as e:
-                    print(f"Error reading sensor {sensor_id}: {e}")
-                    return None
-        print(f"Sensor {sensor_id} not found")
-        return None
+        sensor = self._by_id.get(sensor_id)
+        if sensor is None:
+            log.warning("Sensor %s not found", sensor_id)
+            return None
+        try:
+            return sensor.get_temperature()
+        except Exception as e:
+            log.error("Error reading sensor %s: %s", sensor_id, e)
+            return None
     
     def refresh_sensors(self) -> None:
         """
         Re-scan the bus for sensors (useful if sensors are added/removed).
-        Automatically sets all newly discovered sensors to 10-bit resolution.
+        Automatically sets all newly discovered sensors to 10-bit resolution;
+        sensors that were already known are left untouched.
         """
         self._discover_sensors()
     
@@ -123,17 +242,17 @@ class DS18B20Reader:
         if resolution not in [9, 10, 11, 12]:
             raise ValueError("Resolution must be 9, 10, 11, or 12 bits")
         
-        for sensor in self.sensors:
-            if sensor.id == sensor_id:
-                try:
-                    sensor.set_resolution(resolution)
-                    return True
-                except Exception as e:
-                    print(f"Error setting resolution for sensor {sensor_id}: {e}")
-                    print("Note: Setting resolution may require root permissions")
-                    return False
-        print(f"Sensor {sensor_id} not found")
-        return False
+        sensor = self._by_id.get(sensor_id)
+        if sensor is None:
+            log.warning("Sensor %s not found", sensor_id)
+            return False
+        try:
+            sensor.set_resolution(resolution)
+            return True
+        except Exception as e:
+            log.error("Error setting resolution for sensor %s: %s "
+                      "(setting resolution may require root permissions)", sensor_id, e)
+            return False
     
     def set_all_resolution(self, resolution: int) -> Dict[str, bool]:
         """
@@ -160,15 +279,21 @@ class DS18B20Reader:
         Returns:
             Resolution in bits, or None if sensor not found
         """
-        for sensor in self.sensors:
-            if sensor.id == sensor_id:
-                try:
-                    return sensor.get_resolution()
-                except Exception as e:
-                    print(f"Error getting resolution for sensor {sensor_id}: {e}")
-                    return None
-        print(f"Sensor {sensor_id} not found")
-        return None
+        sensor = self._by_id.get(sensor_id)
+        if sensor is None:
+            log.warning("Sensor %s not found", sensor_id)
+            return None
+        try:
+            return sensor.get_resolution()
+        except Exception as e:
+            log.error("Error getting resolution for sensor %s: %s", sensor_id, e)
+            return None
+    
+    def cleanup(self) -> None:
+        """Shut down the read thread pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
 
 
 def main():
@@ -176,6 +301,7 @@ def main():
     Main demonstration loop that outputs sensor addresses and temperatures
     once every second.
     """
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     print("Initializing DS18B20 sensor reader...")
     reader = DS18B20Reader()
     
@@ -210,6 +336,8 @@ def main():
             
     except KeyboardInterrupt:
         print("\n\nStopped by user.")
+    finally:
+        reader.cleanup()
 
 
 if __name__ == "__main__":
@@ -6,6 +6,8 @@ Demonstrates how to use all four modules together in a single script.
 This is a simple temperature-based fan mode control example.
 """
 
+import bisect
+import logging
 import time
 import signal
 import sys
@@ -26,6 +28,10 @@ class ShopHeater:
     and valve control into a unified system.
     """
     
+    # Fan mode per temperature band: <140°F, 140-158°F, 158-176°F, >=176°F
+    FAN_THRESHOLDS_F = (140, 158, 176)
+    FAN_MODES = ("5v", "5v", "12v", "12v")
+    
     def __init__(self):
         """Initialize all modules."""
         print("Initializing SHOPHEATER3000...")
@@ -61,8 +67,8 @@ class ShopHeater:
             dict: Current system state with sensor readings
         """
         temps = self.temp_reader.read_all_temperatures()
-        temp_c = list(temps.values())[0] if temps else None
-        temp_f = (temp_c * 9/5) + 32 if temp_c is not None else None
+        temp_c = next(iter(temps.values()), None)
+        temp_f = None if temp_c is None else temp_c * 1.8 + 32
         
         flow_rate_lpm = self.flow_meter.getFlowRate()
         total_liters = self.flow_meter.get_flow_liters()
@@ -90,14 +96,7 @@ class ShopHeater:
             return "off"
         
         # Simple temperature-based fan control using relay modes
-        if temp_f < 140:      # Below 140°F
-            fan_mode = "5v"
-        elif temp_f < 158:    # 140-158°F
-            fan_mode = "5v"
-        elif temp_f < 176:    # 158-176°F
-            fan_mode = "12v"
-        else:                 # Above 176°F
-            fan_mode = "12v"
+        fan_mode = self.FAN_MODES[bisect.bisect_right(self.FAN_THRESHOLDS_F, temp_f)]
         
         self.fan.set_mode(fan_mode)
         return fan_mode
@@ -114,23 +113,29 @@ class ShopHeater:
         print()
         print("-" * 80)
         
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        
         try:
             while True:
                 # Read all sensors
                 state = self.read_sensors()
                 
+                stamp = time.strftime('%H:%M:%S')
+                
                 # Control fan based on temperature
                 if state['temp_f'] is not None:
                     fan_mode = self.temperature_control(state['temp_f'])
                     
-                    # Display status
-                    print(f"[{time.strftime('%H:%M:%S')}] "
+                    # Display status (one write per tick)
+                    write(f"[{stamp}] "
                           f"Temp: {state['temp_f']:.1f}°F ({state['temp_c']:.1f}°C) | "
                           f"Fan: {fan_mode.upper():>3} | "
                           f"Flow: {state['flow_rate_lpm']:.2f} L/min | "
-                          f"Total: {state['total_pounds']:.2f} lbs ({state['total_liters']:.2f} L)")
+                          f"Total: {state['total_pounds']:.2f} lbs ({state['total_liters']:.2f} L)\n")
                 else:
-                    print(f"[{time.strftime('%H:%M:%S')}] ERROR: Cannot read temperature sensor")
+                    write(f"[{stamp}] ERROR: Cannot read temperature sensor\n")
+                flush()
                 
                 time.sleep(interval)
         
@@ -159,11 +164,18 @@ class ShopHeater:
         except Exception as e:
             print(f"  ✗ Valve control cleanup error: {e}")
         
+        try:
+            self.temp_reader.cleanup()
+            print("  ✓ Temperature reader cleaned up")
+        except Exception as e:
+            print(f"  ✗ Temperature reader cleanup error: {e}")
+        
         print("Cleanup complete.")
 
 
 def main():
     """Main entry point."""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     heater = None
     
     # Setup signal handler for clean shutdown
@@ -18,6 +18,8 @@ Modes:
 
 import lgpio
 
+from gpio_chip import get_chip
+
 
 class FanRelayController:
     """Controls fan power using two relays."""
@@ -26,7 +28,7 @@ class FanRelayController:
         self.fan_onoff_pin = fan_onoff_pin
         self.voltage_select_pin = voltage_select_pin
 
-        self._chip = lgpio.gpiochip_open(0)
+        self._chip = get_chip()
         lgpio.gpio_claim_output(self._chip, self.fan_onoff_pin)
         lgpio.gpio_claim_output(self._chip, self.voltage_select_pin)
 
@@ -77,8 +79,9 @@ class FanRelayController:
         return normalized
 
     def cleanup(self) -> None:
-        """Release GPIO resources."""
-        try:
-            lgpio.gpiochip_close(self._chip)
-        except Exception:
-            pass
+        """Release GPIO resources (the shared chip handle is closed by gpio_chip at exit)."""
+        for pin in (self.fan_onoff_pin, self.voltage_select_pin):
+            try:
+                lgpio.gpio_free(self._chip, pin)
+            except Exception:
+                pass
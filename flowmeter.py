@@ -12,9 +12,21 @@ Future conversion: 3,119 pulses = 19.9 pounds of water
 """
 
 import lgpio
+import logging
+import sys
 import threading
 import time
 
+import gpio_cdev
+from gpio_chip import get_chip
+
+log = logging.getLogger(__name__)
+
+
+# FL-408: 450 pulses = 1 liter
+_LITERS_PER_PULSE = 1.0 / 450.0
+_LPM_SCALE_NS = 60 * 1_000_000_000 / 450.0  # pulses per nanosecond -> liters per minute
+
 
 class FlowMeter:
     """
@@ -23,11 +35,22 @@ class FlowMeter:
     Uses GPIO interrupts to count pulses without blocking the main thread.
     Designed for portability and easy integration with other codebases.
     
+    Two edge backends are available:
+    - "lgpio" (default): one lgpio callback per pulse
+    - "cdev": reads edge events straight from the gpiochip character device,
+      draining every queued edge with one read() (see gpio_cdev.EdgeCounter).
+      Use this for high pulse rates where per-edge callbacks drop pulses.
+    
     Attributes:
         gpio_pin (int): GPIO pin number (default: 18)
-        pulse_count (int): Total number of pulses counted since initialization
+        pulse_count (int): Raw number of pulses counted since initialization.
+            Only the edge thread writes it; reset() leaves it alone and moves
+            the baseline instead, so use get_pulse_count() for pulses since reset.
         pulses_per_pound (float): Conversion factor (pulses per pound of water)
-        lock (threading.Lock): Thread lock for thread-safe pulse counting
+        lock (threading.Lock): Guards reset() and the flow-rate tracking fields.
+            The pulse callback and the read-only getters do not take it:
+            lgpio (or the cdev drain thread) delivers every edge from one
+            thread, so pulse_count has one writer and reading an int is atomic.
     """
     
     # Conversion factor: 3,119 pulses = 19.9 pounds of water
@@ -39,7 +62,20 @@ class FlowMeter:
     FALLING = lgpio.FALLING_EDGE
     BOTH = lgpio.BOTH_EDGES
     
-    def __init__(self, gpio_pin=27, pulses_per_pound=None, edge=None, pull_up_down=None):
+    # lgpio edge/pull settings -> GPIO v2 line flags for the "cdev" backend
+    _CDEV_EDGE_FLAGS = {
+        lgpio.RISING_EDGE: gpio_cdev.LINE_FLAG_EDGE_RISING,
+        lgpio.FALLING_EDGE: gpio_cdev.LINE_FLAG_EDGE_FALLING,
+        lgpio.BOTH_EDGES: gpio_cdev.LINE_FLAG_EDGE_RISING | gpio_cdev.LINE_FLAG_EDGE_FALLING,
+    }
+    _CDEV_BIAS_FLAGS = {
+        lgpio.SET_PULL_UP: gpio_cdev.LINE_FLAG_BIAS_PULL_UP,
+        lgpio.SET_PULL_DOWN: gpio_cdev.LINE_FLAG_BIAS_PULL_DOWN,
+        lgpio.SET_PULL_NONE: gpio_cdev.LINE_FLAG_BIAS_DISABLED,
+    }
+    
+    def __init__(self, gpio_pin=27, pulses_per_pound=None, edge=None, pull_up_down=None,
+                 backend="lgpio"):
         """
         Initialize the flow meter.
         
@@ -53,15 +89,22 @@ class FlowMeter:
             pull_up_down (int, optional): Pull resistor configuration.
                 lgpio.SET_PULL_UP (default) or lgpio.SET_PULL_DOWN.
                 FL-408 at 3.3V works best with SET_PULL_UP and FALLING edge.
+            backend (str): "lgpio" (default) or "cdev" for batched edge
+                events from /dev/gpiochip0
         """
+        if backend not in ("lgpio", "cdev"):
+            raise ValueError(f"Unknown edge backend: {backend}")
+        self.backend = backend
         self.gpio_pin = gpio_pin
         self.pulse_count = 0
+        self._pulse_base = 0  # pulse_count at the last reset(); written under lock
         self.lock = threading.Lock()
+        self._changed = threading.Event()  # Set when new pulses arrive
         self.edge = edge if edge is not None else self.FALLING
         self.pull_up_down = pull_up_down if pull_up_down is not None else lgpio.SET_PULL_UP
         
         # Flow rate tracking
-        self.last_flow_check_time = time.time()
+        self.last_flow_check_time_ns = time.monotonic_ns()
         self.last_flow_check_pulses = 0
         
         # Set conversion factor
@@ -69,10 +112,28 @@ class FlowMeter:
             self.pulses_per_pound = self.PULSES_PER_POUND
         else:
             self.pulses_per_pound = pulses_per_pound
+        self._inv_pulses_per_pound = 1.0 / self.pulses_per_pound
+        
+        if backend == "cdev":
+            self.chip = None
+            try:
+                self._edge_counter = gpio_cdev.EdgeCounter(
+                    self.gpio_pin,
+                    self._CDEV_EDGE_FLAGS[self.edge] | self._CDEV_BIAS_FLAGS[self.pull_up_down],
+                    self._add_pulses,
+                    consumer="flowmeter",
+                )
+            except OSError as e:
+                raise RuntimeError(
+                    f"Failed to request edge events on GPIO {self.gpio_pin}.\n"
+                    f"Pin may be in use, or you may need to be in the 'gpio' group.\n"
+                    f"Original error: {e}"
+                )
+            return
         
-        # Open GPIO chip
+        # Use the process-wide GPIO chip handle
         try:
-            self.chip = lgpio.gpiochip_open(0)
+            self.chip = get_chip()
         except Exception as e:
             raise RuntimeError(
                 f"Failed to open GPIO chip. Make sure you have proper permissions.\n"
@@ -90,7 +151,6 @@ class FlowMeter:
                 time.sleep(0.1)
                 lgpio.gpio_claim_input(self.chip, self.gpio_pin, self.pull_up_down)
             except Exception as e2:
-                lgpio.gpiochip_close(self.chip)
                 raise RuntimeError(
                     f"Failed to setup GPIO {self.gpio_pin}. Pin may be in use.\n"
                     f"Try: ps aux | grep python | grep -v grep\n"
@@ -112,7 +172,6 @@ class FlowMeter:
             )
         except Exception as e:
             lgpio.gpio_free(self.chip, self.gpio_pin)
-            lgpio.gpiochip_close(self.chip)
             raise RuntimeError(
                 f"Failed to add edge detection on GPIO {self.gpio_pin}.\n"
                 f"Original error: {e}"
@@ -121,7 +180,7 @@ class FlowMeter:
     def _pulse_callback(self, chip, gpio, level, tick):
         """
         Internal callback function for GPIO interrupt.
-        Increments pulse count in a thread-safe manner.
+        Increments pulse count without locking (single writer thread).
         
         Args:
             chip (int): GPIO chip handle
@@ -129,27 +188,60 @@ class FlowMeter:
             level (int): Pin level (0 or 1)
             tick (int): Timestamp in microseconds
         """
-        with self.lock:
-            self.pulse_count += 1
+        self.pulse_count += 1
+        if not self._changed.is_set():
+            self._changed.set()
+    
+    def _add_pulses(self, count):
+        """
+        Edge batch handler for the "cdev" backend.
+        Runs on the EdgeCounter drain thread, the only writer of pulse_count
+        when this backend is used.
+        
+        Args:
+            count (int): Number of edges drained in this batch
+        """
+        self.pulse_count += count
+        if not self._changed.is_set():
+            self._changed.set()
     
     def get_pulse_count(self):
         """
         Get the current pulse count.
         
         Returns:
-            int: Total number of pulses counted since initialization
+            int: Number of pulses counted since initialization or the last reset()
         """
-        with self.lock:
-            return self.pulse_count
+        # Base first: a reset() in between then yields the pre-reset total,
+        # never a negative count
+        base = self._pulse_base
+        return self.pulse_count - base
+    
+    def wait_for_pulses(self, timeout=None):
+        """
+        Block until at least one pulse arrives after the previous call.
+        
+        Args:
+            timeout (float, optional): Maximum seconds to wait (None = forever)
+        
+        Returns:
+            bool: True if pulses arrived, False on timeout
+        """
+        arrived = self._changed.wait(timeout)
+        self._changed.clear()
+        return arrived
     
     def reset(self):
         """
         Reset the pulse count to zero.
         Also resets flow rate tracking.
+        
+        Moves the baseline rather than writing pulse_count, so an edge counted
+        at the same moment on the callback thread cannot undo the reset.
         """
         with self.lock:
-            self.pulse_count = 0
-            self.last_flow_check_time = time.time()
+            self._pulse_base = self.pulse_count
+            self.last_flow_check_time_ns = time.monotonic_ns()
             self.last_flow_check_pulses = 0
     
     def get_flow_pounds(self):
@@ -160,8 +252,7 @@ class FlowMeter:
         Returns:
             float: Pounds of water based on pulse count and measured calibration
         """
-        with self.lock:
-            return self.pulse_count / self.pulses_per_pound
+        return self.get_pulse_count() * self._inv_pulses_per_pound
     
     def get_flow_liters(self):
         """
@@ -171,8 +262,7 @@ class FlowMeter:
         Returns:
             float: Total liters of water based on pulse count
         """
-        with self.lock:
-            return self.pulse_count / 450.0
+        return self.get_pulse_count() * _LITERS_PER_PULSE
     
     def getFlowRate(self):
         """
@@ -189,29 +279,29 @@ class FlowMeter:
             time.sleep(2)
             rate2 = fm.getFlowRate()  # Returns actual flow rate
         """
-        current_time = time.time()
-        
         with self.lock:
-            current_pulses = self.pulse_count
-            time_elapsed = current_time - self.last_flow_check_time
-            pulses_elapsed = current_pulses - self.last_flow_check_pulses
-            
-            # Update tracking variables for next call
-            self.last_flow_check_time = current_time
+            # Read the count and clock under the lock too, so overlapping
+            # callers store their snapshots in order (never a negative delta)
+            current_pulses = self.pulse_count - self._pulse_base
+            # Monotonic clock: NTP or manual clock changes can't skew the rate
+            now_ns = time.monotonic_ns()
+            prev_pulses = self.last_flow_check_pulses
+            prev_ns = self.last_flow_check_time_ns
             self.last_flow_check_pulses = current_pulses
+            self.last_flow_check_time_ns = now_ns
+        
+        elapsed_ns = now_ns - prev_ns
+        pulses_elapsed = current_pulses - prev_pulses
         
-        # Avoid division by zero on very first call
-        if time_elapsed < 0.001:
+        # Avoid division by zero on very first call (under 1 ms)
+        if elapsed_ns < 1_000_000:
             return 0.0
         
         # Calculate flow rate
-        # pulses_elapsed pulses in time_elapsed seconds
+        # pulses_elapsed pulses in elapsed_ns nanoseconds
         # Convert to liters: pulses / 450
-        # Convert to per minute: * (60 / time_elapsed)
-        liters = pulses_elapsed / 450.0
-        flow_rate_lpm = (liters / time_elapsed) * 60.0
-        
-        return flow_rate_lpm
+        # Convert to per minute: * (60e9 / elapsed_ns)
+        return pulses_elapsed * _LPM_SCALE_NS / elapsed_ns
     
     def get_flow_rate_lpm(self, time_interval_seconds=60):
         """
@@ -230,30 +320,29 @@ class FlowMeter:
         # But we need to measure frequency, which requires time-based sampling
         # This is a simplified version - for accurate flow rate, you'd want
         # to track pulses over a known time interval
-        with self.lock:
-            # This is a placeholder - actual implementation would need
-            # time-based pulse counting
-            return 0.0
+        # This is a placeholder - actual implementation would need
+        # time-based pulse counting
+        return 0.0
     
     def cleanup(self):
         """
         Clean up GPIO resources.
         Call this when done using the flow meter.
         """
+        if self.backend == "cdev":
+            self._edge_counter.stop()
+            return
+        
         try:
             self.callback_id.cancel()
-        except:
-            pass
+        except lgpio.error as e:
+            log.warning("cleanup: cancelling GPIO %d callback: %s", self.gpio_pin, e)
         
         try:
             lgpio.gpio_free(self.chip, self.gpio_pin)
-        except:
-            pass
-        
-        try:
-            lgpio.gpiochip_close(self.chip)
-        except:
-            pass
+        except lgpio.error as e:
+            log.warning("cleanup: freeing GPIO %d: %s", self.gpio_pin, e)
+        # The shared chip handle is closed by gpio_chip at exit
 
 
 def main():
@@ -267,10 +356,22 @@ def main():
         print("Flow meter active. Counting pulses...")
         print("Press Ctrl+C to exit\n")
         
+        # Bound methods hoisted out of the display loop
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        get_count = flow_meter.get_pulse_count
+        wait_for_pulses = flow_meter.wait_for_pulses
+        sleep = time.sleep
+        
+        write("Pulses since start: %d\r" % get_count())
+        flush()
+        
         while True:
-            pulse_count = flow_meter.get_pulse_count()
-            print(f"Pulses since start: {pulse_count}", end='\r')
-            time.sleep(0.1)  # Update display every 100ms
+            # Sleep until pulses arrive, then redraw at most every 100ms
+            wait_for_pulses()
+            write("Pulses since start: %d\r" % get_count())
+            flush()
+            sleep(0.1)
             
     except KeyboardInterrupt:
         print("\n\nShutting down...")
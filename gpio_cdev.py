@@ -0,0 +1,172 @@
+"""
+GPIO character device (v2 uAPI) helpers for Raspberry Pi
+
+Talks to /dev/gpiochipN directly with the kernel's GPIO v2 ioctls, without
+going through lgpio. Used where lgpio's one-Python-call-per-edge callback
+model is too slow: EdgeCounter drains every queued edge event with a single
+read() and reports them as one batch.
+
+Struct layouts and ioctl numbers follow include/uapi/linux/gpio.h.
+"""
+
+import fcntl
+import os
+import select
+import struct
+import threading
+
+
+DEFAULT_CHIP = "/dev/gpiochip0"
+
+# struct gpio_v2_line_request is 592 bytes: offsets[64], consumer[32],
+# config (272 bytes), num_lines, event_buffer_size, padding[5], fd
+GPIO_V2_GET_LINE_IOCTL = 0xC250B407
+GPIO_V2_LINE_GET_VALUES_IOCTL = 0xC010B40E
+GPIO_V2_LINE_SET_VALUES_IOCTL = 0xC010B40F
+
+_LINE_REQUEST_SIZE = 592
+_CONSUMER_OFFSET = 256
+_CONFIG_FLAGS_OFFSET = 288
+_NUM_LINES_OFFSET = 560
+_EVENT_BUFFER_SIZE_OFFSET = 564
+_FD_OFFSET = 588
+GPIO_V2_LINES_MAX = 64
+
+# struct gpio_v2_line_values is {u64 bits; u64 mask}
+_LINE_VALUES = struct.Struct("QQ")
+
+# struct gpio_v2_line_event is 48 bytes
+LINE_EVENT_SIZE = 48
+
+# enum gpio_v2_line_flag
+LINE_FLAG_INPUT = 1 << 2
+LINE_FLAG_OUTPUT = 1 << 3
+LINE_FLAG_EDGE_RISING = 1 << 4
+LINE_FLAG_EDGE_FALLING = 1 << 5
+LINE_FLAG_BIAS_PULL_UP = 1 << 8
+LINE_FLAG_BIAS_PULL_DOWN = 1 << 9
+LINE_FLAG_BIAS_DISABLED = 1 << 10
+
+
+def request_lines(offsets, flags, consumer="shopheater", chip_path=DEFAULT_CHIP,
+                  event_buffer_size=0):
+    """
+    Request one or more lines from a gpiochip with the same configuration.
+
+    Args:
+        offsets: GPIO line offsets (BCM numbers on the Pi header chip)
+        flags: OR of LINE_FLAG_* values
+        consumer: Label shown by gpioinfo for the claimed lines
+        chip_path: gpiochip character device (default: /dev/gpiochip0)
+        event_buffer_size: Kernel edge event queue length (0 = kernel default)
+
+    Returns:
+        int: Line request file descriptor (close it with os.close to release)
+    """
+    if not 0 < len(offsets) <= GPIO_V2_LINES_MAX:
+        raise ValueError(f"Between 1 and {GPIO_V2_LINES_MAX} lines can be requested")
+
+    req = bytearray(_LINE_REQUEST_SIZE)
+    struct.pack_into(f"{len(offsets)}I", req, 0, *offsets)
+    req[_CONSUMER_OFFSET:_CONSUMER_OFFSET + 31] = consumer.encode()[:31].ljust(31, b"\0")
+    struct.pack_into("Q", req, _CONFIG_FLAGS_OFFSET, flags)
+    struct.pack_into("I", req, _NUM_LINES_OFFSET, len(offsets))
+    struct.pack_into("I", req, _EVENT_BUFFER_SIZE_OFFSET, event_buffer_size)
+
+    chip_fd = os.open(chip_path, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        fcntl.ioctl(chip_fd, GPIO_V2_GET_LINE_IOCTL, req, True)
+    finally:
+        os.close(chip_fd)
+    return struct.unpack_from("i", req, _FD_OFFSET)[0]
+
+
+def line_values(bits, mask):
+    """
+    Pack a gpio_v2_line_values struct for set_values().
+
+    Args:
+        bits: Line levels, bit i = i-th requested line (1 = HIGH)
+        mask: Which requested lines to change
+    """
+    return _LINE_VALUES.pack(bits, mask)
+
+
+def set_values(fd, values):
+    """Drive output lines of a request to a packed line_values() struct (one ioctl)."""
+    fcntl.ioctl(fd, GPIO_V2_LINE_SET_VALUES_IOCTL, values)
+
+
+def get_values(fd, mask):
+    """
+    Read the levels of a request's lines in one ioctl.
+
+    Returns:
+        int: Line levels, bit i = i-th requested line (only bits in mask are valid)
+    """
+    buf = bytearray(_LINE_VALUES.pack(0, mask))
+    fcntl.ioctl(fd, GPIO_V2_LINE_GET_VALUES_IOCTL, buf, True)
+    return _LINE_VALUES.unpack(buf)[0]
+
+
+class EdgeCounter:
+    """
+    Count edges on one input line from a background drain thread.
+
+    The thread sleeps in epoll until the kernel has queued edge events,
+    then reads all of them in one read() and calls on_events(n) once with
+    the batch size, instead of one Python call per edge.
+    """
+
+    EVENTS_PER_READ = 64
+
+    def __init__(self, offset, flags, on_events, chip_path=DEFAULT_CHIP,
+                 consumer="shopheater"):
+        """
+        Request the line and start draining its events.
+
+        Args:
+            offset: GPIO line offset to watch
+            flags: LINE_FLAG_EDGE_* (plus bias) flags; INPUT is added
+            on_events: Called from the drain thread with the number of new edges
+            chip_path: gpiochip character device (default: /dev/gpiochip0)
+            consumer: Label shown by gpioinfo for the claimed line
+        """
+        self.on_events = on_events
+        self._stopped = False
+        self.fd = request_lines([offset], flags | LINE_FLAG_INPUT, consumer,
+                                chip_path, event_buffer_size=self.EVENTS_PER_READ)
+        os.set_blocking(self.fd, False)
+
+        # Writing to the pipe wakes the drain thread so stop() never waits on an edge
+        self._wake_r, self._wake_w = os.pipe()
+        self._epoll = select.epoll()
+        self._epoll.register(self.fd, select.EPOLLIN)
+        self._epoll.register(self._wake_r, select.EPOLLIN)
+
+        self._thread = threading.Thread(target=self._drain, name=f"gpio{offset}-edges",
+                                        daemon=True)
+        self._thread.start()
+
+    def _drain(self):
+        read_size = LINE_EVENT_SIZE * self.EVENTS_PER_READ
+        while True:
+            for fd, _ in self._epoll.poll():
+                if fd == self._wake_r:
+                    return
+                try:
+                    buf = os.read(self.fd, read_size)
+                except BlockingIOError:
+                    continue
+                self.on_events(len(buf) // LINE_EVENT_SIZE)
+
+    def stop(self):
+        """Stop the drain thread and release the line. Safe to call more than once."""
+        if self._stopped:
+            return
+        self._stopped = True
+        os.write(self._wake_w, b"\0")
+        self._thread.join()
+        self._epoll.close()
+        for fd in (self.fd, self._wake_r, self._wake_w):
+            os.close(fd)
@@ -0,0 +1,49 @@
+"""
+Shared lgpio gpiochip handle for SHOPHEATER3000
+
+FlowMeter, RelayController and FanRelayController all drive lines on
+gpiochip 0. Opening the chip once per process and sharing the handle saves
+a file descriptor per controller, and a single atexit hook closes it after
+every controller's own cleanup has run.
+"""
+
+import atexit
+import threading
+
+import lgpio
+
+
+_chip = None
+_lock = threading.Lock()
+
+
+def get_chip():
+    """
+    Return the process-wide gpiochip 0 handle, opening it on first use.
+
+    Raises:
+        lgpio.error: if the chip cannot be opened (permissions, missing device)
+    """
+    global _chip
+    with _lock:
+        if _chip is None:
+            _chip = lgpio.gpiochip_open(0)
+        return _chip
+
+
+def close_chip():
+    """Close the shared handle. Registered with atexit; safe to call more than once."""
+    global _chip
+    with _lock:
+        if _chip is None:
+            return
+        try:
+            lgpio.gpiochip_close(_chip)
+        except lgpio.error:
+            pass
+        _chip = None
+
+
+# Registered at import, before any controller registers its own cleanup, so
+# (atexit being LIFO) the chip is closed only after all lines are released
+atexit.register(close_chip)
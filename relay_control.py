@@ -17,9 +17,16 @@ Solenoid Behavior:
 """
 
 import lgpio
+import logging
+import os
 import time
 import atexit
 
+import gpio_cdev
+from gpio_chip import get_chip
+
+log = logging.getLogger(__name__)
+
 
 class RelayController:
     """
@@ -29,18 +36,72 @@ class RelayController:
         NORMAL_PIN (int): GPIO pin for normal flow relay (GPIO 23)
         DIVERSION_PIN (int): GPIO pin for diversion relay (GPIO 24)
         chip: lgpio chip handle
+    
+    Both pins are claimed as one lgpio group (leader NORMAL_PIN), so a
+    mode change sets both relays in a single write. Group bit 0 is
+    NORMAL, bit 1 is DIVERSION; a set bit drives the pin HIGH.
+    
+    With backend="cdev" both pins are instead requested as one line
+    request on /dev/gpiochip0 and every write is a single
+    GPIO_V2_LINE_SET_VALUES ioctl on a prebuilt struct, skipping lgpio.
     """
     
     NORMAL_PIN = 23
     DIVERSION_PIN = 24
     
-    def __init__(self):
+    _NORMAL_BIT = 0b01
+    _DIVERSION_BIT = 0b10
+    _BOTH_BITS = _NORMAL_BIT | _DIVERSION_BIT
+    
+    # Group bits per mode (HIGH = relay open, solenoid closed)
+    _MODE_BITS = {
+        "mainloop": _DIVERSION_BIT,   # NORMAL open, DIVERSION closed
+        "diversion": _NORMAL_BIT,     # NORMAL closed, DIVERSION open
+        "mix": 0b00,                  # Both open
+        "closed": _BOTH_BITS,         # Both closed
+    }
+    # Debug log templates (%-formatted lazily by logging)
+    _MSG_NORMAL_HIGH = "GPIO %d (NORMAL) set to HIGH - relay open, solenoid closed"
+    _MSG_NORMAL_LOW = "GPIO %d (NORMAL) set to LOW - relay closed, solenoid open"
+    _MSG_DIVERSION_HIGH = "GPIO %d (DIVERSION) set to HIGH - relay open, solenoid closed"
+    _MSG_DIVERSION_LOW = "GPIO %d (DIVERSION) set to LOW - relay closed, solenoid open"
+    _MSG_MODE = "%s (GPIO %d %s, GPIO %d %s)"
+    _MODE_MESSAGES = {
+        "mainloop": "Mode: MAIN LOOP - Normal path open, diversion closed",
+        "diversion": "Mode: DIVERSION - Normal path closed, diversion open",
+        "mix": "Mode: MIX - Both paths open",
+        "closed": "Mode: ALL CLOSED - Both paths closed",
+    }
+    
+    def __init__(self, backend="lgpio"):
         """
         Initialize the relay controller and setup GPIO pins.
         Registers cleanup handler for safe shutdown.
+        
+        Args:
+            backend (str): "lgpio" (default) or "cdev" for direct gpiochip ioctls
         """
+        if backend not in ("lgpio", "cdev"):
+            raise ValueError(f"Unknown GPIO backend: {backend}")
+        self.backend = backend
+        self._cleaned_up = False
+        
+        if backend == "cdev":
+            self._setup_cdev()
+        else:
+            self._setup_lgpio()
+        
+        # Register cleanup handler
+        atexit.register(self.cleanup)
+        
+        print(f"RelayController initialized:")
+        print(f"  NORMAL relay on GPIO {self.NORMAL_PIN}")
+        print(f"  DIVERSION relay on GPIO {self.DIVERSION_PIN}")
+    
+    def _setup_lgpio(self):
+        """Claim both pins as an lgpio output group."""
         try:
-            self.chip = lgpio.gpiochip_open(0)
+            self.chip = get_chip()
         except Exception as e:
             raise RuntimeError(
                 f"Failed to open GPIO chip. Make sure you have proper permissions.\n"
@@ -48,23 +109,52 @@ class RelayController:
                 f"Original error: {e}"
             )
         
-        # Setup both pins as outputs
+        # Setup both pins as one output group (both start LOW, as before)
         try:
-            lgpio.gpio_claim_output(self.chip, self.NORMAL_PIN)
-            lgpio.gpio_claim_output(self.chip, self.DIVERSION_PIN)
+            lgpio.group_claim_output(self.chip, [self.NORMAL_PIN, self.DIVERSION_PIN], [0, 0])
         except Exception as e:
-            lgpio.gpiochip_close(self.chip)
             raise RuntimeError(
                 f"Failed to setup GPIO pins. Pins may be in use.\n"
                 f"Original error: {e}"
             )
-        
-        # Register cleanup handler
-        atexit.register(self.cleanup)
-        
-        print(f"RelayController initialized:")
-        print(f"  NORMAL relay on GPIO {self.NORMAL_PIN}")
-        print(f"  DIVERSION relay on GPIO {self.DIVERSION_PIN}")
+    
+    def _setup_cdev(self):
+        """Request both pins as outputs on the gpiochip device (both start LOW)."""
+        self.chip = None
+        try:
+            self._line_fd = gpio_cdev.request_lines(
+                [self.NORMAL_PIN, self.DIVERSION_PIN],
+                gpio_cdev.LINE_FLAG_OUTPUT,
+                consumer="relay_control",
+            )
+        except OSError as e:
+            raise RuntimeError(
+                f"Failed to setup GPIO pins. Pins may be in use, or you may need\n"
+                f"to be in the 'gpio' group.\n"
+                f"Original error: {e}"
+            )
+        # Every (bits, mask) write this class issues, packed once
+        self._line_values = {
+            (bits, mask): gpio_cdev.line_values(bits, mask)
+            for mask in (self._NORMAL_BIT, self._DIVERSION_BIT, self._BOTH_BITS)
+            for bits in range(self._BOTH_BITS + 1)
+            if not bits & ~mask
+        }
+    
+    def _write_bits(self, bits, mask):
+        """Drive the pins selected by mask to bits (bit 0 NORMAL, bit 1 DIVERSION)."""
+        if self.backend == "cdev":
+            gpio_cdev.set_values(self._line_fd, self._line_values[bits, mask])
+        else:
+            lgpio.group_write(self.chip, self.NORMAL_PIN, bits, mask)
+    
+    def _read_bits(self):
+        """Read both pin levels (bit 0 NORMAL, bit 1 DIVERSION)."""
+        if self.backend == "cdev":
+            return gpio_cdev.get_values(self._line_fd, self._BOTH_BITS)
+        # One read for the whole group; returns (group size, levels)
+        _, levels = lgpio.group_read(self.chip, self.NORMAL_PIN)
+        return levels
     
     # ========== Core GPIO Control Functions ==========
     
@@ -73,35 +163,49 @@ class RelayController:
         Set NORMAL relay GPIO (23) to HIGH.
         This opens the relay, cutting power to the solenoid (solenoid closes).
         """
-        lgpio.gpio_write(self.chip, self.NORMAL_PIN, 1)
-        print(f"GPIO {self.NORMAL_PIN} (NORMAL) set to HIGH - relay open, solenoid closed")
+        self._write_bits(self._NORMAL_BIT, self._NORMAL_BIT)
+        log.debug(self._MSG_NORMAL_HIGH, self.NORMAL_PIN)
     
     def normal_low(self):
         """
         Set NORMAL relay GPIO (23) to LOW.
         This closes the relay, providing power to the solenoid (solenoid opens).
         """
-        lgpio.gpio_write(self.chip, self.NORMAL_PIN, 0)
-        print(f"GPIO {self.NORMAL_PIN} (NORMAL) set to LOW - relay closed, solenoid open")
+        self._write_bits(0, self._NORMAL_BIT)
+        log.debug(self._MSG_NORMAL_LOW, self.NORMAL_PIN)
     
     def diversion_high(self):
         """
         Set DIVERSION relay GPIO (24) to HIGH.
         This opens the relay, cutting power to the solenoid (solenoid closes).
         """
-        lgpio.gpio_write(self.chip, self.DIVERSION_PIN, 1)
-        print(f"GPIO {self.DIVERSION_PIN} (DIVERSION) set to HIGH - relay open, solenoid closed")
+        self._write_bits(self._DIVERSION_BIT, self._DIVERSION_BIT)
+        log.debug(self._MSG_DIVERSION_HIGH, self.DIVERSION_PIN)
     
     def diversion_low(self):
         """
         Set DIVERSION relay GPIO (24) to LOW.
         This closes the relay, providing power to the solenoid (solenoid opens).
         """
-        lgpio.gpio_write(self.chip, self.DIVERSION_PIN, 0)
-        print(f"GPIO {self.DIVERSION_PIN} (DIVERSION) set to LOW - relay closed, solenoid open")
+        self._write_bits(0, self._DIVERSION_BIT)
+        log.debug(self._MSG_DIVERSION_LOW, self.DIVERSION_PIN)
     
     # ========== Mode Control Functions ==========
     
+    def set_mode(self, mode):
+        """
+        Set both relays for a valve mode with one group write.
+        
+        Args:
+            mode (str): "mainloop", "diversion", "mix" or "closed"
+        """
+        bits = self._MODE_BITS[mode]
+        self._write_bits(bits, self._BOTH_BITS)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(self._MSG_MODE, self._MODE_MESSAGES[mode],
+                      self.NORMAL_PIN, "HIGH" if bits & self._NORMAL_BIT else "LOW",
+                      self.DIVERSION_PIN, "HIGH" if bits & self._DIVERSION_BIT else "LOW")
+    
     def mainLoop(self):
         """
         Set relays for main loop operation.
@@ -110,9 +214,7 @@ class RelayController:
         
         This allows flow through the main/normal path.
         """
-        self.normal_low()      # Open NORMAL solenoid
-        self.diversion_high()  # Close DIVERSION solenoid
-        print("Mode: MAIN LOOP - Normal path open, diversion closed")
+        self.set_mode("mainloop")
     
     def diversion(self):
         """
@@ -122,9 +224,7 @@ class RelayController:
         
         This diverts flow through the diversion path.
         """
-        self.normal_high()    # Close NORMAL solenoid
-        self.diversion_low()  # Open DIVERSION solenoid
-        print("Mode: DIVERSION - Normal path closed, diversion open")
+        self.set_mode("diversion")
     
     def mix(self):
         """
@@ -134,9 +234,7 @@ class RelayController:
         
         This opens both solenoids, allowing flow through both paths.
         """
-        self.normal_low()      # Open NORMAL solenoid
-        self.diversion_low()   # Open DIVERSION solenoid
-        print("Mode: MIX - Both paths open")
+        self.set_mode("mix")
     
     def all_closed(self):
         """
@@ -146,12 +244,20 @@ class RelayController:
         
         This stops flow through both paths.
         """
-        self.normal_high()     # Close NORMAL solenoid
-        self.diversion_high()  # Close DIVERSION solenoid
-        print("Mode: ALL CLOSED - Both paths closed")
+        self.set_mode("closed")
     
     # ========== Status and Utility Functions ==========
     
+    def read_states(self):
+        """
+        Read current GPIO states without printing.
+        
+        Returns:
+            tuple: (normal_state, diversion_state) where 0=LOW, 1=HIGH
+        """
+        levels = self._read_bits()
+        return (levels & self._NORMAL_BIT, (levels & self._DIVERSION_BIT) >> 1)
+    
     def get_status(self):
         """
         Read and display current GPIO states.
@@ -159,8 +265,7 @@ class RelayController:
         Returns:
             tuple: (normal_state, diversion_state) where 0=LOW, 1=HIGH
         """
-        normal_state = lgpio.gpio_read(self.chip, self.NORMAL_PIN)
-        diversion_state = lgpio.gpio_read(self.chip, self.DIVERSION_PIN)
+        normal_state, diversion_state = self.read_states()
         
         print(f"\nCurrent GPIO States:")
         print(f"  GPIO {self.NORMAL_PIN} (NORMAL): {'HIGH' if normal_state else 'LOW'} "
@@ -174,22 +279,25 @@ class RelayController:
         """
         Clean up GPIO resources.
         Sets both relays to safe state (both HIGH - solenoids closed).
+        Runs from atexit as well, so a second call is a no-op.
         """
+        if self._cleaned_up:
+            return
+        self._cleaned_up = True
+        
         try:
             # Set both to HIGH (safe state - solenoids closed)
-            lgpio.gpio_write(self.chip, self.NORMAL_PIN, 1)
-            lgpio.gpio_write(self.chip, self.DIVERSION_PIN, 1)
-            
-            # Free GPIO pins
-            lgpio.gpio_free(self.chip, self.NORMAL_PIN)
-            lgpio.gpio_free(self.chip, self.DIVERSION_PIN)
+            self._write_bits(self._BOTH_BITS, self._BOTH_BITS)
             
-            # Close chip
-            lgpio.gpiochip_close(self.chip)
+            if self.backend == "cdev":
+                os.close(self._line_fd)
+            else:
+                # Free GPIO group (the shared chip handle is closed by gpio_chip at exit)
+                lgpio.group_free(self.chip, self.NORMAL_PIN)
             
             print("\nGPIO cleanup complete - both solenoids closed (safe state)")
-        except:
-            pass
+        except (lgpio.error, OSError) as e:
+            log.warning("cleanup: %s", e)
 
 
 def main():
@@ -197,6 +305,9 @@ def main():
     Interactive test menu for relay control.
     Provides text-based command interface for testing all relay functions.
     """
+    # Show every relay write in the interactive menu
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+    
     print("=" * 60)
     print("Shop Heater Relay Control - Interactive Test Menu")
     print("=" * 60)
@@ -205,6 +316,18 @@ def main():
         controller = RelayController()
         print("\nRelay controller ready!\n")
         
+        commands = {
+            "mainloop": controller.mainLoop,
+            "diversion": controller.diversion,
+            "mix": controller.mix,
+            "closed": controller.all_closed,
+            "nh": controller.normal_high,
+            "nl": controller.normal_low,
+            "dh": controller.diversion_high,
+            "dl": controller.diversion_low,
+            "status": controller.get_status,
+        }
+        
         while True:
             print("\n" + "-" * 60)
             print("Available Commands:")
@@ -229,32 +352,9 @@ def main():
             
             command = input("\nEnter command: ").strip().lower()
             
-            if command == "mainloop":
-                controller.mainLoop()
-            
-            elif command == "diversion":
-                controller.diversion()
-            
-            elif command == "mix":
-                controller.mix()
-            
-            elif command == "closed":
-                controller.all_closed()
-            
-            elif command == "nh":
-                controller.normal_high()
-            
-            elif command == "nl":
-                controller.normal_low()
-            
-            elif command == "dh":
-                controller.diversion_high()
-            
-            elif command == "dl":
-                controller.diversion_low()
-            
-            elif command == "status":
-                controller.get_status()
+            handler = commands.get(command)
+            if handler is not None:
+                handler()
             
             elif command == "help":
                 continue  # Will redisplay menu
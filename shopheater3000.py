@@ -5,14 +5,22 @@ FastAPI backend for real-time monitoring and control
 """
 
 import asyncio
+import atexit
 import json
 import csv
+import logging
+import logging.handlers
+import operator
+import queue
 from datetime import datetime
 from typing import Dict, Optional, List
 from pathlib import Path
 from collections import deque
+from dataclasses import dataclass, field
+import threading
 import time
 
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
@@ -23,6 +31,44 @@ from ds18b20_reader import DS18B20Reader
 from flowmeter import FlowMeter
 from relay_control import RelayController
 
+log = logging.getLogger("shopheater")
+_log_listener = None
+
+
+def configure_logging(level=logging.INFO):
+    """
+    Send log records through a queue to a listener thread, so formatting and
+    the stderr write happen off the event loop. No-op if logging is already set up.
+    """
+    global _log_listener
+    root = logging.getLogger()
+    if _log_listener is not None or root.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    log_queue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+    _log_listener = logging.handlers.QueueListener(log_queue, handler)
+    _log_listener.start()
+    # Drain whatever is still queued when the process exits
+    atexit.register(_log_listener.stop)
+
+# Session logs live next to this file; created once at import
+DATA_DIR = Path(__file__).resolve().parent / "data_logs"
+GRAPH_DIR = Path(__file__).resolve().parent / "graph_sessions"
+DATA_DIR.mkdir(exist_ok=True)
+GRAPH_DIR.mkdir(exist_ok=True)
+
+# Column order of the session CSV files
+CSV_FIELDS = (
+    'timestamp',
+    'water_hot', 'water_reservoir', 'water_mix', 'water_cold', 'air_cool', 'air_heated',
+    'delta_water_heater', 'delta_water_radiator', 'delta_air',
+    'flow_rate', 'fan_voltage', 'fan_mode', 'main_loop_state', 'diversion_state',
+    'control_mode', 'flow_mode'
+)
+
 
 class ShopHeaterController:
     """Main controller integrating all hardware modules."""
@@ -49,19 +95,43 @@ class ShopHeaterController:
         '158200872bfa': -0.38    # Reads 0.38°C high
     }
     
+    LOG_FLUSH_ROWS = 12  # Flush the CSV and graph logs every minute (at the 5 s cadence)
+    
+    # (delta name, minuend, subtrahend) over the logical temperature names
+    _DELTA_SPECS = (
+        ('delta_water_heater', 'water_hot', 'water_cold'),
+        ('delta_water_radiator', 'water_mix', 'water_cold'),
+        ('delta_air', 'air_heated', 'air_cool'),
+    )
+    # Non-temperature fields copied from a sensor data packet into each logged point
+    _POINT_STATE_FIELDS = (
+        'flow_rate', 'fan_voltage', 'fan_mode', 'main_loop_state', 'diversion_state',
+        'control_mode', 'flow_mode'
+    )
+    
     def __init__(self):
         """Initialize all hardware modules."""
-        print("Initializing Shop Heater Controller...")
+        log.info("Initializing Shop Heater Controller...")
         
         # Initialize hardware
         self.fan = FanRelayController(fan_onoff_pin=18, voltage_select_pin=17)
         self.temp_reader = DS18B20Reader()
         self.flow_meter = FlowMeter(gpio_pin=27)
         self.valve_control = RelayController()
+        # read_sensor_data() runs in worker threads; one 1-Wire read at a time
+        self._sensor_lock = threading.Lock()
+        self._last_data: Optional[Dict] = None  # Most recent read_sensor_data() result
+        self._last_data_time = 0.0  # time.monotonic() when _last_data was read
         
         # Sensor mapping (will be populated from discovered sensors)
         # User will need to identify which physical sensor corresponds to which location
         self.sensor_map = self._initialize_sensor_map()
+        # (name, sensor_id, Fahrenheit bias) in map order, for read_sensor_data().
+        # (c + offset) * 9/5 + 32 == c * 1.8 + bias, with the offset folded into bias
+        self._map_pairs = tuple(
+            (name, sensor_id, 32.0 + self.SENSOR_OFFSETS.get(sensor_id, 0.0) * 1.8)
+            for name, sensor_id in self.sensor_map.items()
+        )
         
         # Current state
         self.current_fan_mode = "12v"
@@ -74,8 +144,13 @@ class ShopHeaterController:
         # Data logging and graphing state
         self.save_enabled = False
         self.graph_enabled = False
-        self.saved_data = []  # Data collected when save_enabled is True
-        self.graph_data = []  # Data collected when graph_enabled is True
+        self.saved_count = 0  # Rows written to the CSV log since save_enabled
+        self._csv_file = None  # Open CSV log while save_enabled is True
+        self._csv_writer = None
+        self._csv_row = None  # Picks a data point's values in CSV column order
+        self._csv_filename = None
+        self.graph_count = 0  # Points spooled to disk since graph_enabled
+        self._graph_file = None  # Open NDJSON spool while graph_enabled is True
         self.save_start_time = None  # Timestamp when logging started
         self.graph_start_time = None  # Timestamp when graphing started
 
@@ -102,9 +177,9 @@ class ShopHeaterController:
         # Calculate initial flow mode based on valve states (should be 'mix')
         self.calculate_flow_mode()
         
-        print(f"SAFETY: Both valves initialized to OPEN (flow_mode: {self.flow_mode})")
+        log.info("SAFETY: Both valves initialized to OPEN (flow_mode: %s)", self.flow_mode)
         
-        print("Controller initialized successfully")
+        log.info("Controller initialized successfully")
     
     def _initialize_sensor_map(self) -> Dict[str, Optional[str]]:
         """
@@ -123,12 +198,12 @@ class ShopHeaterController:
             'air_cool': '031294970b3f'
         }
         
-        print(f"Found {len(sensor_ids)} temperature sensors")
-        print("Sensor mapping:")
+        log.info("Found %d temperature sensors", len(sensor_ids))
+        log.info("Sensor mapping:")
         for name, sensor_id in sensor_map.items():
             # Check if assigned sensor is actually present
             status = "✓" if sensor_id in sensor_ids else "✗ NOT FOUND"
-            print(f"  {name}: {sensor_id} {status}")
+            log.info("  %s: %s %s", name, sensor_id, status)
         
         return sensor_map
     
@@ -148,31 +223,26 @@ class ShopHeaterController:
         """
         Read all sensor data and return as a dictionary.
         Temperatures are converted to Fahrenheit.
+        Blocks on 1-Wire I/O: call it via asyncio.to_thread() from the event loop.
         """
         # Read all temperatures
-        all_temps = self.temp_reader.read_all_temperatures()
+        with self._sensor_lock:
+            all_temps = self.temp_reader.read_all_temperatures()
+            # Let the next conversion run while this snapshot is sent out
+            self.temp_reader.start_conversion()
         
         # Map to logical names and convert to Fahrenheit with calibration
+        # (inlined celsius_to_fahrenheit(): one dict lookup per sensor)
         temps = {}
-        for name, sensor_id in self.sensor_map.items():
-            if sensor_id and sensor_id in all_temps:
-                # Pass sensor_id for calibration
-                temps[name] = self.celsius_to_fahrenheit(all_temps[sensor_id], sensor_id)
-            else:
-                temps[name] = None
+        for name, sensor_id, bias in self._map_pairs:
+            celsius = all_temps.get(sensor_id)
+            temps[name] = None if celsius is None else round(celsius * 1.8 + bias, 1)
         
         # Calculate deltas (only if both temps are available)
-        delta_water_heater = None
-        if temps['water_hot'] is not None and temps['water_cold'] is not None:
-            delta_water_heater = round(temps['water_hot'] - temps['water_cold'], 1)
-        
-        delta_water_radiator = None
-        if temps['water_mix'] is not None and temps['water_cold'] is not None:
-            delta_water_radiator = round(temps['water_mix'] - temps['water_cold'], 1)
-        
-        delta_air = None
-        if temps['air_heated'] is not None and temps['air_cool'] is not None:
-            delta_air = round(temps['air_heated'] - temps['air_cool'], 1)
+        deltas = {}
+        for name, a, b in self._DELTA_SPECS:
+            hot, cold = temps[a], temps[b]
+            deltas[name] = None if hot is None or cold is None else round(hot - cold, 1)
         
         # Read flow rate
         flow_rate = round(self.flow_meter.getFlowRate(), 2)
@@ -180,12 +250,18 @@ class ShopHeaterController:
         # Assemble data packet
         data = {
             'temperatures': temps,
-            'deltas': {
-                'delta_water_heater': delta_water_heater,
-                'delta_water_radiator': delta_water_radiator,
-                'delta_air': delta_air
-            },
+            'deltas': deltas,
             'flow_rate': flow_rate,
+            **self._control_state()
+        }
+        
+        self._last_data = data
+        self._last_data_time = time.monotonic()
+        return data
+    
+    def _control_state(self) -> Dict:
+        """Fan, valve, mode and logging state fields of a sensor data packet."""
+        return {
             'fan_voltage': self.current_fan_voltage,
             'fan_mode': self.current_fan_mode,
             'main_loop_state': self.main_loop_state,
@@ -200,8 +276,28 @@ class ShopHeaterController:
             'save_enabled': self.save_enabled,
             'graph_enabled': self.graph_enabled
         }
+    
+    def current_state(self) -> Optional[Dict]:
+        """
+        Latest sensor readings with up-to-date control state, without
+        touching the sensors.
         
-        return data
+        Returns:
+            Same layout as read_sensor_data(), or None before the first read
+        """
+        if self._last_data is None:
+            return None
+        return {**self._last_data, **self._control_state()}
+    
+    def recent_sensor_data(self, max_age_s: float) -> Dict:
+        """
+        Like read_sensor_data(), but reuse the last reading if it is at most
+        max_age_s old, so loops on the same cadence share one sensor read.
+        Blocks when it has to read: call it via asyncio.to_thread().
+        """
+        if self._last_data is not None and time.monotonic() - self._last_data_time <= max_age_s:
+            return self.current_state()
+        return self.read_sensor_data()
     
     def _fan_mode_to_voltage(self, mode: str) -> int:
         """Map fan relay mode to numeric voltage for graphing/logging."""
@@ -216,7 +312,7 @@ class ShopHeaterController:
         normalized = self.fan.set_mode(mode)
         self.current_fan_mode = normalized
         self.current_fan_voltage = self._fan_mode_to_voltage(normalized)
-        print(f"Fan mode set to {normalized.upper()} ({self.current_fan_voltage}V)")
+        log.info("Fan mode set to %s (%dV)", normalized.upper(), self.current_fan_voltage)
 
     def set_fan_speed(self, speed: int):
         """
@@ -225,11 +321,11 @@ class ShopHeaterController:
         """
         speed = max(0, min(100, speed))
         if speed <= 0:
-            self.set_fan_mode("off")
+            self._set_fan_mode_if_changed("off")
         elif speed <= 71:
-            self.set_fan_mode("5v")
+            self._set_fan_mode_if_changed("5v")
         else:
-            self.set_fan_mode("12v")
+            self._set_fan_mode_if_changed("12v")
     
     def set_main_loop(self, state: bool):
         """
@@ -242,17 +338,19 @@ class ShopHeaterController:
         """
         # SAFETY CHECK: Prevent both valves from being closed
         if not state and not self.diversion_state:
-            print("⚠️  SAFETY OVERRIDE: Cannot close main loop while diversion is closed!")
-            print("    Automatically opening diversion valve to maintain flow path...")
+            log.warning("SAFETY OVERRIDE: Cannot close main loop while diversion is closed!")
+            log.warning("    Automatically opening diversion valve to maintain flow path...")
             self.valve_control.diversion_low()  # Force diversion open
             self.diversion_state = True
+        elif state == self.main_loop_state:
+            return  # Already in that state: skip the relay write
         
         if state:
             self.valve_control.normal_low()  # Turn on
         else:
             self.valve_control.normal_high()  # Turn off
         self.main_loop_state = state
-        print(f"Main loop: {'ON' if state else 'OFF'}")
+        log.debug("Main loop: %s", 'ON' if state else 'OFF')
         self.calculate_flow_mode()
     
     def set_diversion(self, state: bool):
@@ -266,17 +364,19 @@ class ShopHeaterController:
         """
         # SAFETY CHECK: Prevent both valves from being closed
         if not state and not self.main_loop_state:
-            print("⚠️  SAFETY OVERRIDE: Cannot close diversion while main loop is closed!")
-            print("    Automatically opening main loop valve to maintain flow path...")
+            log.warning("SAFETY OVERRIDE: Cannot close diversion while main loop is closed!")
+            log.warning("    Automatically opening main loop valve to maintain flow path...")
             self.valve_control.normal_low()  # Force main loop open
             self.main_loop_state = True
+        elif state == self.diversion_state:
+            return  # Already in that state: skip the relay write
         
         if state:
             self.valve_control.diversion_low()  # Turn on
         else:
             self.valve_control.diversion_high()  # Turn off
         self.diversion_state = state
-        print(f"Diversion: {'ON' if state else 'OFF'}")
+        log.debug("Diversion: %s", 'ON' if state else 'OFF')
         self.calculate_flow_mode()
     
     def set_control_mode(self, mode: str):
@@ -287,13 +387,13 @@ class ShopHeaterController:
         """
         if mode in ['manual', 'automatic']:
             self.control_mode = mode
-            print(f"Control mode set to: {mode.upper()}")
+            log.info("Control mode set to: %s", mode.upper())
             if mode == "automatic":
                 self._auto_below_return_since = None
                 self._auto_pending_downstep = None
                 self._auto_force_diversion = False
         else:
-            print(f"Invalid control mode: {mode}. Must be 'manual' or 'automatic'.")
+            log.warning("Invalid control mode: %s. Must be 'manual' or 'automatic'.", mode)
 
     def _compute_rate_f_per_min(self, history: deque) -> float:
         """Compute slope from oldest/newest sample in F/min."""
@@ -323,7 +423,7 @@ class ShopHeaterController:
         self.set_main_loop(False)
         self.set_diversion(True)
 
-    def run_automatic_control(self):
+    def run_automatic_control(self, data: Optional[Dict] = None):
         """
         Automatic mode:
         - Keep fans OFF until air is warm enough (comfort gate)
@@ -331,6 +431,9 @@ class ShopHeaterController:
         - Escalate to 12V early based on predicted hot-water rise
         - Force diversion-only when predicted hot risk exceeds threshold
         - Recover to main-only after sustained cooldown
+        
+        Args:
+            data: Snapshot from read_sensor_data() (read here if not given)
         """
         if self.control_mode != "automatic":
             self._auto_fan_target = self.current_fan_mode
@@ -339,7 +442,8 @@ class ShopHeaterController:
             self._auto_air_probe_until = 0.0
             return
 
-        data = self.read_sensor_data()
+        if data is None:
+            data = self.read_sensor_data()
         temps = data.get("temperatures", {})
         deltas = data.get("deltas", {})
 
@@ -520,45 +624,50 @@ class ShopHeaterController:
             self._auto_pending_downstep = None
             self._auto_reason = f"Cooling hold complete: downshifted to {desired_fan.upper()}"
     
-    def set_save_enabled(self, state: bool):
+    async def set_save_enabled(self, state: bool):
         """
         Enable or disable data logging.
-        When enabled, collects data every 5 seconds to be saved to CSV on shutdown.
+        When enabled, appends a row every 5 seconds to a CSV file that is
+        closed when logging is disabled or on shutdown. The finished file is
+        closed in a worker thread so the event loop does not wait on the disk.
         """
         old_state = self.save_enabled
         self.save_enabled = state
         
         if state and not old_state:
-            # Just enabled - clear old data and start fresh session
-            self.saved_data = []
+            # Just enabled - start a fresh session file
+            self.saved_count = 0
             self.save_start_time = datetime.now()
-            print(f"Data logging ENABLED - session started at {self.save_start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            self._open_csv_log()
+            log.info("Data logging ENABLED - session started at %s", self.save_start_time.strftime('%Y-%m-%d %H:%M:%S'))
         elif not state and old_state:
-            # Just disabled - save the session now
-            if self.saved_data:
-                self.save_to_csv()
-            print(f"Data logging DISABLED - {len(self.saved_data)} records saved")
+            # Just disabled - close the session file now
+            log.info("Data logging DISABLED - %d records saved", self.saved_count)
+            closed = self._detach_csv_log()
+            if closed is not None:
+                await asyncio.to_thread(self._finish_csv_log, *closed)
     
-    def set_graph_enabled(self, state: bool):
+    async def set_graph_enabled(self, state: bool):
         """
         Enable or disable live graphing.
         When enabled, collects data every 5 seconds for real-time graphing.
-        When disabled, saves session and clears data.
+        When disabled, saves the session file from a worker thread.
         """
         old_state = self.graph_enabled
         self.graph_enabled = state
         
         if state and not old_state:
-            # Just enabled - clear old data and start fresh session
-            self.graph_data = []
+            # Just enabled - start a fresh session spool
+            self.graph_count = 0
             self.graph_start_time = datetime.now()
-            print(f"Live graphing ENABLED - session started at {self.graph_start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            self._open_graph_log()
+            log.info("Live graphing ENABLED - session started at %s", self.graph_start_time.strftime('%Y-%m-%d %H:%M:%S'))
         elif not state and old_state:
             # Just disabled - save the session
-            if self.graph_data:
-                self.save_graph_session()
-            print(f"Live graphing DISABLED - {len(self.graph_data)} records saved")
-            self.graph_data = []  # Clear data after saving
+            log.info("Live graphing DISABLED - %d records saved", self.graph_count)
+            closed = self._detach_graph_log()
+            if closed is not None:
+                await asyncio.to_thread(self._finish_graph_session, *closed)
     
     def calculate_flow_mode(self):
         """
@@ -575,143 +684,214 @@ class ShopHeaterController:
             # Both off - should not happen in normal operation
             self.flow_mode = 'none'
         
-        print(f"Flow mode calculated: {self.flow_mode.upper()} (main={self.main_loop_state}, diversion={self.diversion_state})")
+        log.debug("Flow mode calculated: %s (main=%s, diversion=%s)",
+                  self.flow_mode.upper(), self.main_loop_state, self.diversion_state)
     
-    def collect_data_point(self):
+    def collect_data_point(self, data: Optional[Dict] = None):
         """
         Collect a single data point for logging/graphing.
         Called every 5 seconds by the data collection task.
+        
+        Args:
+            data: Snapshot from read_sensor_data() (read here if not given)
         """
         if not self.save_enabled and not self.graph_enabled:
             return  # Nothing to do
         
         # Get current sensor data
-        data = self.read_sensor_data()
+        if data is None:
+            data = self.read_sensor_data()
         
-        # Create a flattened data point with timestamp
+        # Create a flattened data point with timestamp, temperatures, deltas, other data
         data_point = {
             'timestamp': datetime.now().isoformat(),
-            # Temperatures
-            'water_hot': data['temperatures']['water_hot'],
-            'water_reservoir': data['temperatures']['water_reservoir'],
-            'water_mix': data['temperatures']['water_mix'],
-            'water_cold': data['temperatures']['water_cold'],
-            'air_cool': data['temperatures']['air_cool'],
-            'air_heated': data['temperatures']['air_heated'],
-            # Deltas
-            'delta_water_heater': data['deltas']['delta_water_heater'],
-            'delta_water_radiator': data['deltas']['delta_water_radiator'],
-            'delta_air': data['deltas']['delta_air'],
-            # Other data
-            'flow_rate': data['flow_rate'],
-            'fan_voltage': data['fan_voltage'],
-            'fan_mode': data['fan_mode'],
-            'main_loop_state': data['main_loop_state'],
-            'diversion_state': data['diversion_state'],
-            'control_mode': data['control_mode'],
-            'flow_mode': data['flow_mode']
+            **data['temperatures'],
+            **data['deltas']
         }
+        for key in self._POINT_STATE_FIELDS:
+            data_point[key] = data[key]
         
-        # Add to appropriate lists
-        if self.save_enabled:
-            self.saved_data.append(data_point)
+        # Append to the CSV log and/or the graph spool
+        if self.save_enabled and self._csv_writer is not None:
+            self._csv_writer.writerow(self._csv_row(data_point))
+            self.saved_count += 1
+            if self.saved_count % self.LOG_FLUSH_ROWS == 0:
+                self._csv_file.flush()
         
-        if self.graph_enabled:
-            self.graph_data.append(data_point)
+        if self.graph_enabled and self._graph_file is not None:
+            self._graph_file.write(orjson.dumps(data_point) + b'\n')
+            self.graph_count += 1
+            if self.graph_count % self.LOG_FLUSH_ROWS == 0:
+                self._graph_file.flush()
     
-    def save_to_csv(self):
+    def _open_csv_log(self):
         """
-        Save collected data to a CSV file in data_logs/ subdirectory.
+        Create the session CSV file in data_logs/ subdirectory and write its header.
         Uses timestamp from when logging started (not shutdown).
         """
-        if not self.saved_data or not self.save_start_time:
-            print("No data to save")
-            return
-        
         # Generate filename with session START timestamp
         timestamp = self.save_start_time.strftime("%Y-%m-%d_%H-%M-%S")
         filename = f"session_{timestamp}.csv"
         
         # Save to data_logs subdirectory
-        data_dir = Path(__file__).parent / "data_logs"
-        data_dir.mkdir(exist_ok=True)
-        filepath = data_dir / filename
+        filepath = DATA_DIR / filename
         
-        # Define CSV fieldnames
-        fieldnames = [
-            'timestamp', 
-            'water_hot', 'water_reservoir', 'water_mix', 'water_cold', 'air_cool', 'air_heated',
-            'delta_water_heater', 'delta_water_radiator', 'delta_air',
-            'flow_rate', 'fan_voltage', 'fan_mode', 'main_loop_state', 'diversion_state',
-            'control_mode', 'flow_mode'
-        ]
+        try:
+            self._csv_file = open(filepath, 'w', newline='')
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(CSV_FIELDS)
+            self._csv_row = operator.itemgetter(*CSV_FIELDS)
+            self._csv_filename = filename
+        except Exception as e:
+            log.error("Error creating CSV: %s", e)
+            if self._csv_file:
+                self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+    
+    def _detach_csv_log(self):
+        """
+        Take the open CSV file off the controller, so a new session can start
+        while this one is finished.
         
+        Returns:
+            (file, filename, row count) for _finish_csv_log(), or None if no file is open
+        """
+        if self._csv_file is None:
+            return None
+        closed = (self._csv_file, self._csv_filename, self.saved_count)
+        self._csv_file = None
+        self._csv_writer = None
+        return closed
+    
+    @staticmethod
+    def _finish_csv_log(csvfile, filename, rows):
+        """Close a detached CSV file, removing it if no rows were collected."""
         try:
-            with open(filepath, 'w', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(self.saved_data)
-            
-            print(f"✅ Saved {len(self.saved_data)} records to data_logs/{filename}")
+            csvfile.close()
+            if rows == 0:
+                Path(csvfile.name).unlink()
+                log.info("No data to save")
+                return
+            log.info("Saved %d records to data_logs/%s", rows, filename)
         except Exception as e:
-            print(f"❌ Error saving CSV: {e}")
+            log.error("Error saving CSV: %s", e)
     
-    def save_graph_session(self):
+    def save_to_csv(self):
         """
-        Save graph session data to JSON file in graph_sessions/ subdirectory.
-        Uses timestamp from when graphing started.
+        Finish the CSV session file in data_logs/ subdirectory.
+        Rows are written as they are collected; this flushes and closes the
+        file (removing it if no rows were collected).
         """
-        if not self.graph_data or not self.graph_start_time:
-            print("No graph data to save")
+        closed = self._detach_csv_log()
+        if closed is None:
+            log.info("No data to save")
+            return
+        self._finish_csv_log(*closed)
+    
+    def _open_graph_log(self):
+        """
+        Create the session's NDJSON spool file in graph_sessions/ subdirectory.
+        Points are appended to it as they are collected, so a graph session
+        never has to be held in memory; save_graph_session() turns it into
+        the final JSON file.
+        """
+        timestamp = self.graph_start_time.strftime("%Y-%m-%d_%H-%M-%S")
+        try:
+            self._graph_file = open(GRAPH_DIR / f"graph_{timestamp}.ndjson", 'wb')
+        except Exception as e:
+            log.error("Error creating graph spool file: %s", e)
+            self._graph_file = None
+    
+    def _detach_graph_log(self):
+        """
+        Take the open graph spool off the controller, so a new session can
+        start while this one is saved.
+        
+        Returns:
+            (spool, start time, end time, point count) for _finish_graph_session(),
+            or None if no spool is open
+        """
+        if self._graph_file is None or not self.graph_start_time:
+            return None
+        closed = (self._graph_file, self.graph_start_time, datetime.now(), self.graph_count)
+        self._graph_file = None
+        return closed
+    
+    @staticmethod
+    def _finish_graph_session(spool, start_time, end_time, points):
+        """
+        Turn a detached spool into graph_<start>.json next to it.
+        Copies the spooled points into the file one line at a time and
+        removes the spool file.
+        """
+        spool.close()
+        spool_path = Path(spool.name)
+        if points == 0:
+            spool_path.unlink()
+            log.info("No graph data to save")
             return
         
         # Generate filename with session START timestamp
-        timestamp = self.graph_start_time.strftime("%Y-%m-%d_%H-%M-%S")
+        timestamp = start_time.strftime("%Y-%m-%d_%H-%M-%S")
         filename = f"graph_{timestamp}.json"
-        
-        # Save to graph_sessions subdirectory
-        graph_dir = Path(__file__).parent / "graph_sessions"
-        graph_dir.mkdir(exist_ok=True)
-        filepath = graph_dir / filename
+        filepath = spool_path.with_name(filename)
         
         # Calculate session duration
-        duration_seconds = (datetime.now() - self.graph_start_time).total_seconds()
+        duration_seconds = (end_time - start_time).total_seconds()
         
         # Create session metadata
-        session_data = {
-            'metadata': {
-                'start_time': self.graph_start_time.isoformat(),
-                'end_time': datetime.now().isoformat(),
-                'duration_seconds': duration_seconds,
-                'data_points': len(self.graph_data)
-            },
-            'data': self.graph_data
+        metadata = {
+            'start_time': start_time.isoformat(),
+            'end_time': end_time.isoformat(),
+            'duration_seconds': duration_seconds,
+            'data_points': points
         }
         
         try:
-            with open(filepath, 'w') as jsonfile:
-                json.dump(session_data, jsonfile, indent=2)
+            # Same {"metadata": ..., "data": [...]} layout, one point per line
+            with open(spool_path, 'rb') as points_file, open(filepath, 'wb') as jsonfile:
+                jsonfile.write(b'{"metadata": ' + orjson.dumps(metadata) + b',\n"data": [\n')
+                separator = b''
+                for line in points_file:
+                    jsonfile.write(separator + line.rstrip(b'\n'))
+                    separator = b',\n'
+                jsonfile.write(b'\n]}\n')
+            spool_path.unlink()
             
-            print(f"✅ Saved graph session ({len(self.graph_data)} points, {duration_seconds:.1f}s) to graph_sessions/{filename}")
+            log.info("Saved graph session (%d points, %.1fs) to graph_sessions/%s",
+                     points, duration_seconds, filename)
         except Exception as e:
-            print(f"❌ Error saving graph session: {e}")
+            log.error("Error saving graph session: %s", e)
+    
+    def save_graph_session(self):
+        """
+        Save graph session data to JSON file in graph_sessions/ subdirectory.
+        Uses timestamp from when graphing started.
+        """
+        closed = self._detach_graph_log()
+        if closed is None:
+            log.info("No graph data to save")
+            return
+        self._finish_graph_session(*closed)
     
     def cleanup(self):
         """Clean up all hardware resources and save data if needed."""
-        print("Cleaning up hardware...")
+        log.info("Cleaning up hardware...")
         
-        # Save data to CSV if we collected any
-        if self.saved_data:
+        # Close the CSV log if logging is still on
+        if self._csv_file is not None:
             self.save_to_csv()
         
-        # Save graph session if we collected any
-        if self.graph_data:
+        # Save graph session if graphing is still on
+        if self._graph_file is not None:
             self.save_graph_session()
         
         self.fan.cleanup()
         self.flow_meter.cleanup()
         self.valve_control.cleanup()
-        print("Cleanup complete")
+        self.temp_reader.cleanup()
+        log.info("Cleanup complete")
 
 
 # Global controller instance
@@ -725,30 +905,127 @@ app.mount("/images", StaticFiles(directory="images"), name="images")
 app.mount("/data_logs", StaticFiles(directory="data_logs"), name="data_logs")
 app.mount("/graph_sessions", StaticFiles(directory="graph_sessions"), name="graph_sessions")
 
+# Messages a slow client may fall behind by before the oldest are dropped
+CHANNEL_QUEUE_SIZE = 8
+# Further WebSocket connections are refused (close code 1013, "try again later")
+MAX_WS_CONNECTIONS = 32
+# A client whose socket takes longer than this to accept one message is dropped
+SEND_TIMEOUT_S = 2.0
+
+
+@dataclass(eq=False, slots=True)
+class Channel:
+    """
+    One connected WebSocket client.
+    Messages are queued here and written by the client's own relay task,
+    so a slow socket only delays its own updates, never everyone's.
+    """
+    websocket: WebSocket
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=CHANNEL_QUEUE_SIZE))
+    task: Optional[asyncio.Task] = None
+
+    def send(self, message: bytes):
+        """Queue a message without waiting, dropping the oldest if the queue is full."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Snapshots are complete state, so a stale one is safe to lose
+            self.queue.get_nowait()
+            self.queue.put_nowait(message)
+
+    async def relay(self):
+        """Write queued messages to the socket until it fails or the task is cancelled."""
+        try:
+            while True:
+                message = await self.queue.get()
+                await asyncio.wait_for(self.websocket.send_bytes(message), timeout=SEND_TIMEOUT_S)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            log.warning("Client send timed out after %.1fs, closing connection", SEND_TIMEOUT_S)
+            if _drop_channel(self):
+                log.info("Removed stalled client. Remaining: %d", len(active_connections))
+            # Ends the endpoint's receive loop for this client as well
+            try:
+                await asyncio.wait_for(self.websocket.close(code=1011), timeout=SEND_TIMEOUT_S)
+            except Exception:
+                pass
+        except Exception as e:
+            log.warning("Error sending to client: %s", e)
+            if _drop_channel(self):
+                log.info("Removed disconnected client. Remaining: %d", len(active_connections))
+
+
 # Connected WebSocket clients
-active_connections: list[WebSocket] = []
+active_connections: set[Channel] = set()
+
+# Set while at least one client is connected; the broadcast loop idles on it
+_has_clients = asyncio.Event()
+
+
+def _drop_channel(channel: Channel) -> bool:
+    """Forget a client. Returns False if it had already been removed."""
+    if channel not in active_connections:
+        return False
+    active_connections.discard(channel)
+    if not active_connections:
+        _has_clients.clear()
+    return True
+
+
+# Seconds between sensor broadcasts; setting _tick broadcasts immediately
+BROADCAST_INTERVAL_S = 5.0
+_tick = asyncio.Event()
+
+# Seconds between logged data points and between automatic control passes
+COLLECTION_INTERVAL_S = 5.0
+AUTO_CONTROL_INTERVAL_S = 5.0
+
+
+async def ticks(period: float):
+    """
+    Yield every `period` seconds on a fixed schedule, so the time spent in
+    the loop body does not stretch the cadence. If the body falls more than
+    a whole period behind, the schedule restarts instead of bursting.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + period
+    while True:
+        await asyncio.sleep(max(0.0, deadline - loop.time()))
+        yield
+        deadline += period
+        if loop.time() - deadline > period:
+            deadline = loop.time() + period
+
+
+def encode_message(data: Dict) -> bytes:
+    """
+    Serialize a state snapshot for the WebSocket clients as UTF-8 JSON.
+    Encode once per snapshot and send the same bytes to every client
+    (as a binary frame, so the socket layer does not re-encode per client).
+    orjson writes compact JSON straight to bytes.
+    """
+    return orjson.dumps(data)
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize hardware on startup."""
     global controller
-    print("=" * 60)
-    print("STARTUP EVENT TRIGGERED")
-    print("=" * 60)
+    # No-op when __main__ already configured logging; covers `uvicorn shopheater3000:app`
+    configure_logging()
+    log.info("Startup event triggered")
     try:
         controller = ShopHeaterController()
-        print("Controller initialized successfully in startup event")
+        log.info("Controller initialized successfully in startup event")
         
         # Start background tasks
         asyncio.create_task(sensor_broadcast_loop())
         asyncio.create_task(data_collection_loop())
         asyncio.create_task(automatic_control_loop())
-        print("Background tasks created (sensor broadcast + data collection + automatic control)")
-    except Exception as e:
-        print(f"ERROR IN STARTUP: {e}")
-        import traceback
-        traceback.print_exc()
+        log.info("Background tasks created (sensor broadcast + data collection + automatic control)")
+    except Exception:
+        log.exception("Error in startup")
         raise
 
 
@@ -756,6 +1033,14 @@ async def startup_event():
 async def shutdown_event():
     """Clean up hardware on shutdown."""
     global controller
+    # Stop every client's relay task and wait for them together
+    tasks = [channel.task for channel in active_connections if channel.task]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    active_connections.clear()
+    _has_clients.clear()
+    
     if controller:
         controller.cleanup()
 
@@ -763,162 +1048,190 @@ async def shutdown_event():
 async def sensor_broadcast_loop():
     """
     Background task that reads sensors and broadcasts to all connected clients.
-    Sends temperature/sensor data every 5 seconds.
+    Sends temperature/sensor data every 5 seconds, or as soon as _tick is set.
+    Sleeps until a client connects when nobody is listening.
     Control state changes are sent immediately via command handler.
     """
-    print("Sensor broadcast loop started")
+    log.info("Sensor broadcast loop started")
     while True:
-        await asyncio.sleep(5.0)  # Update every 5 seconds (temperature updates only)
+        await _has_clients.wait()
+        try:
+            await asyncio.wait_for(_tick.wait(), timeout=BROADCAST_INTERVAL_S)
+        except asyncio.TimeoutError:
+            pass
+        _tick.clear()
         
         if controller and active_connections:
             try:
-                data = controller.read_sensor_data()
-                message = json.dumps(data)
-                print(f"Broadcasting temperatures to {len(active_connections)} clients: {len(message)} bytes")
-                
-                # Broadcast to all connected clients
-                disconnected = []
-                for connection in active_connections:
-                    try:
-                        await connection.send_text(message)
-                    except Exception as e:
-                        print(f"Error sending to client: {e}")
-                        disconnected.append(connection)
+                data = await asyncio.to_thread(controller.read_sensor_data)
+                message = encode_message(data)
+                log.debug("Broadcasting temperatures to %d clients: %d bytes",
+                          len(active_connections), len(message))
                 
-                # Remove disconnected clients
-                for connection in disconnected:
-                    if connection in active_connections:
-                        active_connections.remove(connection)
-                        print(f"Removed disconnected client. Remaining: {len(active_connections)}")
-            except Exception as e:
-                print(f"Error in sensor broadcast: {e}")
-                import traceback
-                traceback.print_exc()
+                # Queue for every client; each relay task does its own socket write
+                for channel in active_connections:
+                    channel.send(message)
+            except Exception:
+                log.exception("Error in sensor broadcast")
 
 
 async def data_collection_loop():
     """
     Background task that collects data points every 5 seconds for logging/graphing.
-    Runs independently of sensor broadcast to ensure consistent data collection.
+    Runs independently of sensor broadcast to ensure consistent data collection,
+    but reuses the broadcast's reading when it is from the current interval.
     """
-    print("Data collection loop started")
-    while True:
-        await asyncio.sleep(5.0)  # Collect data every 5 seconds
-        
+    log.info("Data collection loop started")
+    async for _ in ticks(COLLECTION_INTERVAL_S):  # Collect data every 5 seconds
         if controller:
             try:
                 # Collect data if either save or graph is enabled
                 if controller.save_enabled or controller.graph_enabled:
-                    controller.collect_data_point()
+                    data = await asyncio.to_thread(controller.recent_sensor_data, BROADCAST_INTERVAL_S)
+                    controller.collect_data_point(data)
                     
                     # Log collection status
-                    status_parts = []
-                    if controller.save_enabled:
-                        status_parts.append(f"Save: {len(controller.saved_data)} records")
-                    if controller.graph_enabled:
-                        status_parts.append(f"Graph: {len(controller.graph_data)} records")
-                    
-                    if status_parts:
-                        print(f"Data collected - {', '.join(status_parts)}")
-            except Exception as e:
-                print(f"Error in data collection: {e}")
-                import traceback
-                traceback.print_exc()
+                    if log.isEnabledFor(logging.DEBUG):
+                        status_parts = []
+                        if controller.save_enabled:
+                            status_parts.append(f"Save: {controller.saved_count} records")
+                        if controller.graph_enabled:
+                            status_parts.append(f"Graph: {controller.graph_count} records")
+                        log.debug("Data collected - %s", ', '.join(status_parts))
+            except Exception:
+                log.exception("Error in data collection")
 
 
 async def automatic_control_loop():
-    """Background task that runs automatic control logic every 5 seconds."""
-    print("Automatic control loop started")
-    while True:
-        await asyncio.sleep(5.0)
-
+    """
+    Background task that runs automatic control logic every 5 seconds,
+    on the latest shared sensor reading when it is from the current interval.
+    """
+    log.info("Automatic control loop started")
+    async for _ in ticks(AUTO_CONTROL_INTERVAL_S):
         if controller:
             try:
-                controller.run_automatic_control()
-            except Exception as e:
-                print(f"Error in automatic control: {e}")
-                import traceback
-                traceback.print_exc()
+                if controller.control_mode == "automatic":
+                    data = await asyncio.to_thread(controller.recent_sensor_data, AUTO_CONTROL_INTERVAL_S)
+                    controller.run_automatic_control(data)
+                else:
+                    controller.run_automatic_control()
+            except Exception:
+                log.exception("Error in automatic control")
+
+
+# Commands arriving this close together are merged (later values win), for
+# at most COMMAND_BATCH_MAX_S so a fast sender cannot postpone them forever
+COMMAND_COALESCE_S = 0.02
+COMMAND_BATCH_MAX_S = 0.1
+
+# Keys whose effect depends on what was applied before them: control_mode
+# gates the manual-only keys, and the valve safety interlock depends on the
+# order of main_loop/diversion. Messages with these keys are never merged
+ORDERED_COMMAND_KEYS = frozenset(('control_mode', 'main_loop', 'diversion'))
+
+# WebSocket command key -> (manual mode only, controller setter, value conversion)
+COMMAND_HANDLERS = {
+    'fan_speed': (True, ShopHeaterController.set_fan_speed, int),
+    'fan_mode': (True, ShopHeaterController.set_fan_mode, str),
+    'main_loop': (True, ShopHeaterController.set_main_loop, bool),
+    'diversion': (True, ShopHeaterController.set_diversion, bool),
+    'control_mode': (False, ShopHeaterController.set_control_mode, str),
+    'save_enabled': (False, ShopHeaterController.set_save_enabled, bool),
+    'graph_enabled': (False, ShopHeaterController.set_graph_enabled, bool),
+}
+
+
+async def apply_command(command: Dict):
+    """Apply one (possibly merged) command message through COMMAND_HANDLERS."""
+    manual_override_allowed = controller.control_mode == "manual"
+    
+    for key, value in command.items():
+        handler = COMMAND_HANDLERS.get(key)
+        if handler is None:
+            continue
+        manual_only, setter, convert = handler
+        if manual_only and not manual_override_allowed:
+            log.info("Ignoring %s command in AUTOMATIC mode", key)
+            continue
+        result = setter(controller, convert(value))
+        if asyncio.iscoroutine(result):
+            await result
 
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time data and control."""
     await websocket.accept()
-    active_connections.append(websocket)
-    print(f"Client connected. Total connections: {len(active_connections)}")
+    if len(active_connections) >= MAX_WS_CONNECTIONS:
+        log.warning("Refusing WebSocket client: %d connections already open", len(active_connections))
+        await websocket.close(code=1013)
+        return
+    channel = Channel(websocket)
+    channel.task = asyncio.create_task(channel.relay())
+    active_connections.add(channel)
+    _has_clients.set()
+    log.info("Client connected. Total connections: %d", len(active_connections))
     
     # Send initial data immediately
     try:
         if controller:
-            data = controller.read_sensor_data()
-            message = json.dumps(data)
-            print(f"Sending initial data to client: {len(message)} bytes")
-            await websocket.send_text(message)
-            print("Initial data sent successfully")
-    except Exception as e:
-        print(f"Error sending initial data: {e}")
-        import traceback
-        traceback.print_exc()
+            message = encode_message(await asyncio.to_thread(controller.read_sensor_data))
+            log.debug("Sending initial data to client: %d bytes", len(message))
+            channel.send(message)
+    except Exception:
+        log.exception("Error sending initial data")
     
     try:
         while True:
             # Receive control commands from client
             data = await websocket.receive_text()
-            command = json.loads(data)
+            commands = [orjson.loads(data)]
+            
+            # Merge any commands that follow within COMMAND_COALESCE_S (e.g. a
+            # dragged slider) so they are applied and answered once. Cancelling
+            # a pending receive does not drop the message it was waiting for
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + COMMAND_BATCH_MAX_S
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    data = await asyncio.wait_for(websocket.receive_text(),
+                                                  timeout=min(COMMAND_COALESCE_S, remaining))
+                except asyncio.TimeoutError:
+                    break
+                command = orjson.loads(data)
+                # Order-sensitive messages are applied on their own, in arrival order
+                if ORDERED_COMMAND_KEYS.isdisjoint(command) and ORDERED_COMMAND_KEYS.isdisjoint(commands[-1]):
+                    commands[-1].update(command)
+                else:
+                    commands.append(command)
             
             # Process command
             if controller:
-                manual_override_allowed = controller.control_mode == "manual"
-
-                if 'fan_speed' in command:
-                    if manual_override_allowed:
-                        controller.set_fan_speed(int(command['fan_speed']))
-                    else:
-                        print("Ignoring fan_speed command in AUTOMATIC mode")
-                
-                if 'fan_mode' in command:
-                    if manual_override_allowed:
-                        controller.set_fan_mode(str(command['fan_mode']))
-                    else:
-                        print("Ignoring fan_mode command in AUTOMATIC mode")
-                
-                if 'main_loop' in command:
-                    if manual_override_allowed:
-                        controller.set_main_loop(bool(command['main_loop']))
-                    else:
-                        print("Ignoring main_loop command in AUTOMATIC mode")
+                for command in commands:
+                    await apply_command(command)
                 
-                if 'diversion' in command:
-                    if manual_override_allowed:
-                        controller.set_diversion(bool(command['diversion']))
-                    else:
-                        print("Ignoring diversion command in AUTOMATIC mode")
-                
-                if 'control_mode' in command:
-                    controller.set_control_mode(str(command['control_mode']))
-                
-                if 'save_enabled' in command:
-                    controller.set_save_enabled(bool(command['save_enabled']))
-                
-                if 'graph_enabled' in command:
-                    controller.set_graph_enabled(bool(command['graph_enabled']))
-                
-                # Immediately send updated state back to client after command
-                updated_data = controller.read_sensor_data()
-                await websocket.send_text(json.dumps(updated_data))
-                print(f"Sent immediate state update after command: {command}")
+                # Immediately send updated state back to client after command.
+                # Sensor values come from the last read; the next broadcast refreshes them
+                updated_data = controller.current_state()
+                if updated_data is None:
+                    updated_data = await asyncio.to_thread(controller.read_sensor_data)
+                channel.send(encode_message(updated_data))
+                # Push the change to the other clients too, with fresh readings
+                _tick.set()
+                log.debug("Sent immediate state update after commands: %s", commands)
     
     except WebSocketDisconnect:
-        if websocket in active_connections:
-            active_connections.remove(websocket)
-        print(f"Client disconnected. Total connections: {len(active_connections)}")
-    except Exception as e:
-        print(f"WebSocket error: {e}")
-        import traceback
-        traceback.print_exc()
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+        _drop_channel(channel)
+        log.info("Client disconnected. Total connections: %d", len(active_connections))
+    except Exception:
+        log.exception("WebSocket error")
+        _drop_channel(channel)
+    finally:
+        channel.task.cancel()
 
 
 @app.get("/")
@@ -954,11 +1267,10 @@ async def read_advanced():
 @app.get("/api/sessions")
 async def list_sessions():
     """List all CSV log sessions."""
-    data_dir = Path(__file__).parent / "data_logs"
     sessions = []
     
-    if data_dir.exists():
-        for csv_file in sorted(data_dir.glob("session_*.csv"), reverse=True):
+    if DATA_DIR.exists():
+        for csv_file in sorted(DATA_DIR.glob("session_*.csv"), reverse=True):
             stats = csv_file.stat()
             sessions.append({
                 'filename': csv_file.name,
@@ -970,11 +1282,41 @@ async def list_sessions():
     return {"sessions": sessions}
 
 
+def _csv_value(value):
+    """Convert one CSV cell back to a bool or float where it looks like one."""
+    lowered = value.lower()
+    if lowered == 'true':
+        return True
+    if lowered == 'false':
+        return False
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def read_session_csv(filepath):
+    """
+    Parse a session CSV into a list of row dicts (timestamps stay strings).
+    Blocks on file I/O: call it via asyncio.to_thread() from the event loop.
+    """
+    with open(filepath, 'r', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, None)
+        if header is None:
+            return []
+        # Convert by column position: the timestamp column is passed through
+        converters = [str if key == 'timestamp' else _csv_value for key in header]
+        return [
+            {key: convert(value) for key, convert, value in zip(header, converters, row)}
+            for row in reader if row
+        ]
+
+
 @app.get("/api/session_data/{filename}")
 async def get_session_data(filename: str):
     """Get full data from a CSV session file as JSON."""
-    data_dir = Path(__file__).parent / "data_logs"
-    filepath = data_dir / filename
+    filepath = DATA_DIR / filename
     
     # Security: ensure filename is safe
     if not filename.startswith("session_") or not filename.endswith(".csv"):
@@ -984,60 +1326,68 @@ async def get_session_data(filename: str):
         return {"error": "Session not found"}
     
     try:
-        data = []
-        with open(filepath, 'r') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                # Convert numeric strings to floats where applicable
-                converted = {}
-                for key, value in row.items():
-                    if key == 'timestamp':
-                        converted[key] = value
-                    elif value.lower() in ('true', 'false'):
-                        converted[key] = value.lower() == 'true'
-                    else:
-                        try:
-                            converted[key] = float(value)
-                        except (ValueError, TypeError):
-                            converted[key] = value
-                data.append(converted)
-        
+        data = await asyncio.to_thread(read_session_csv, filepath)
         return {"data": data, "count": len(data)}
     except Exception as e:
         return {"error": str(e)}
 
 
+# filename -> ((st_mtime_ns, st_size), listing entry); saved graph files never
+# change after they are written, so each one is parsed once
+_graph_listing_cache = {}
+
+
+def _graph_session_entry(json_file):
+    """Read a graph session's metadata into its /api/graph_sessions entry."""
+    with open(json_file, 'r') as f:
+        metadata = json.load(f).get('metadata', {})
+    return {
+        'filename': json_file.name,
+        'start_time': metadata.get('start_time'),
+        'end_time': metadata.get('end_time'),
+        'duration': metadata.get('duration_seconds'),
+        'data_points': metadata.get('data_points'),
+        'type': 'graph'
+    }
+
+
 @app.get("/api/graph_sessions")
 async def list_graph_sessions():
     """List all saved graph sessions."""
-    graph_dir = Path(__file__).parent / "graph_sessions"
     sessions = []
+    seen = set()
     
-    if graph_dir.exists():
-        for json_file in sorted(graph_dir.glob("graph_*.json"), reverse=True):
+    if GRAPH_DIR.exists():
+        for json_file in sorted(GRAPH_DIR.glob("graph_*.json"), reverse=True):
             try:
-                with open(json_file, 'r') as f:
-                    data = json.load(f)
-                    metadata = data.get('metadata', {})
-                    sessions.append({
-                        'filename': json_file.name,
-                        'start_time': metadata.get('start_time'),
-                        'end_time': metadata.get('end_time'),
-                        'duration': metadata.get('duration_seconds'),
-                        'data_points': metadata.get('data_points'),
-                        'type': 'graph'
-                    })
+                stats = json_file.stat()
+                key = (stats.st_mtime_ns, stats.st_size)
+                cached = _graph_listing_cache.get(json_file.name)
+                if cached is None or cached[0] != key:
+                    cached = (key, _graph_session_entry(json_file))
+                    _graph_listing_cache[json_file.name] = cached
+                sessions.append(cached[1])
+                seen.add(json_file.name)
             except Exception as e:
-                print(f"Error reading {json_file}: {e}")
+                log.warning("Error reading %s: %s", json_file, e)
+    
+    # Forget deleted files
+    for name in _graph_listing_cache.keys() - seen:
+        del _graph_listing_cache[name]
     
     return {"sessions": sessions}
 
 
+def _read_json(filepath):
+    """Load a JSON file. Blocks on file I/O: call it via asyncio.to_thread()."""
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+
 @app.get("/api/load_session/{filename}")
 async def load_session(filename: str):
     """Load a specific graph session."""
-    graph_dir = Path(__file__).parent / "graph_sessions"
-    filepath = graph_dir / filename
+    filepath = GRAPH_DIR / filename
     
     # Security: ensure filename doesn't contain path traversal
     if ".." in filename or "/" in filename:
@@ -1047,8 +1397,8 @@ async def load_session(filename: str):
         return {"error": "Session not found"}
     
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        # Long sessions are megabytes of JSON: read and parse them in a worker thread
+        return await asyncio.to_thread(_read_json, filepath)
     except Exception as e:
         return {"error": str(e)}
 
@@ -1056,8 +1406,7 @@ async def load_session(filename: str):
 @app.delete("/api/delete_graph_session/{filename}")
 async def delete_graph_session(filename: str):
     """Delete a specific graph session file."""
-    graph_dir = Path(__file__).parent / "graph_sessions"
-    filepath = graph_dir / filename
+    filepath = GRAPH_DIR / filename
     
     # Security: ensure filename doesn't contain path traversal
     if ".." in filename or "/" in filename:
@@ -1071,19 +1420,18 @@ async def delete_graph_session(filename: str):
         return {"success": False, "error": "Session not found"}
     
     try:
-        filepath.unlink()  # Delete the file
-        print(f"🗑️ Deleted graph session: {filename}")
+        await asyncio.to_thread(filepath.unlink)  # Delete the file off the event loop
+        log.info("Deleted graph session: %s", filename)
         return {"success": True, "message": f"Deleted {filename}"}
     except Exception as e:
-        print(f"❌ Error deleting graph session {filename}: {e}")
+        log.error("Error deleting graph session %s: %s", filename, e)
         return {"success": False, "error": str(e)}
 
 
 @app.delete("/api/delete_csv_session/{filename}")
 async def delete_csv_session(filename: str):
     """Delete a specific CSV data log file."""
-    data_dir = Path(__file__).parent / "data_logs"
-    filepath = data_dir / filename
+    filepath = DATA_DIR / filename
     
     # Security: ensure filename doesn't contain path traversal
     if ".." in filename or "/" in filename:
@@ -1097,11 +1445,11 @@ async def delete_csv_session(filename: str):
         return {"success": False, "error": "Session not found"}
     
     try:
-        filepath.unlink()  # Delete the file
-        print(f"🗑️ Deleted CSV session: {filename}")
+        await asyncio.to_thread(filepath.unlink)  # Delete the file off the event loop
+        log.info("Deleted CSV session: %s", filename)
         return {"success": True, "message": f"Deleted {filename}"}
     except Exception as e:
-        print(f"❌ Error deleting CSV session {filename}: {e}")
+        log.error("Error deleting CSV session %s: %s", filename, e)
         return {"success": False, "error": str(e)}
 
 
@@ -1111,17 +1459,10 @@ async def test_arrows():
     return FileResponse("test_arrows.html")
 
 
-@app.get("/images/{filename}")
-async def get_image(filename: str):
-    """Serve images from the images directory."""
-    image_path = Path("images") / filename
-    if image_path.exists():
-        return FileResponse(image_path)
-    return {"error": "Image not found"}
-
-
 if __name__ == "__main__":
     import uvicorn
+    
+    configure_logging()
     import socket
     
     # Get local IP address for LAN access
@@ -1160,7 +1501,14 @@ if __name__ == "__main__":
     print("=" * 60)
     
     try:
-        uvicorn.run(app, host="0.0.0.0", port=8000)
+        uvicorn.run(
+            app, host="0.0.0.0", port=8000,
+            # From uvicorn[standard]; named so a missing install fails loudly
+            # instead of silently falling back to asyncio/h11
+            loop="uvloop", http="httptools", ws="websockets",
+            ws_per_message_deflate=False,  # Small snapshots: compressing costs more CPU than LAN bytes
+            access_log=False,  # No line per HTTP request; errors are still logged
+        )
     except KeyboardInterrupt:
         print("\nShutting down...")
 
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for BTS7960Controller kick-start handling
+
+Runs without hardware: lgpio is replaced by a stub that records every
+PWM duty written. Run with: python -m unittest test_bts7960_controller
+"""
+
+import asyncio
+import sys
+import types
+import unittest
+
+
+class FakeLgpio(types.ModuleType):
+    """Just enough of lgpio for the soft-PWM backend; records tx_pwm duties."""
+
+    error = RuntimeError
+
+    def __init__(self):
+        super().__init__("lgpio")
+        self.duties = []
+
+    def gpiochip_open(self, chip):
+        return 0
+
+    def gpio_claim_output(self, chip, pin):
+        pass
+
+    def gpio_free(self, chip, pin):
+        pass
+
+    def gpiochip_close(self, chip):
+        pass
+
+    def tx_pwm(self, chip, pin, freq, duty):
+        self.duties.append(duty)
+
+
+fake_lgpio = FakeLgpio()
+sys.modules.setdefault("lgpio", fake_lgpio)
+
+from bts7960_controller import BTS7960Controller  # noqa: E402
+
+
+class KickStartAsyncTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.lgpio = sys.modules["lgpio"]
+        self.controller = BTS7960Controller()
+        self.controller.KICK_START_S = 0.05
+        self.lgpio.duties.clear()
+
+    def tearDown(self):
+        self.controller.cleanup()
+
+    async def test_kick_start_drops_to_requested_speed(self):
+        await self.controller.set_speed_async(40)
+        self.assertEqual(self.lgpio.duties, [99, 40])
+
+    async def test_cancelled_kick_start_still_drops_to_requested_speed(self):
+        task = asyncio.create_task(self.controller.set_speed_async(40))
+        await asyncio.sleep(0.01)  # kick-start running at 99%
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(self.lgpio.duties, [99, 40])
+        self.assertIsNone(self.controller._kick_pending)
+
+        # Later speed changes reach the PWM again
+        self.controller.set_speed(60)
+        self.assertEqual(self.lgpio.duties, [99, 40, 60])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,15 +6,27 @@ Checks that all dependencies are installed and source codebases are accessible.
 Does NOT require hardware - just verifies software setup.
 """
 
+import functools
+import importlib
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 
-def check_packages():
-    """Check that all required packages are installed."""
-    print("=" * 60)
-    print("Checking installed packages...")
-    print("=" * 60)
+# Report formatting
+BAR = "=" * 60
+BANNER = "\n".join((
+    "╔" + "=" * 58 + "╗",
+    "║" + " " * 15 + "SHOPHEATER3000 SETUP VERIFICATION" + " " * 10 + "║",
+    "╚" + "=" * 58 + "╝",
+))
+
+
+def check_packages(out):
+    """Check that all required packages are installed. Report lines go to out."""
+    out.append(BAR)
+    out.append("Checking installed packages...")
+    out.append(BAR)
     
     required = {
         'lgpio': '0.2.2.0',
@@ -24,31 +36,34 @@ def check_packages():
     
     all_ok = True
     
+    # Deferred: importlib.metadata pulls in email/zipfile/csv, so load it only
+    # once the banner is out
+    import importlib.metadata
+    import importlib.util
+    
+    # Read versions from the installed package metadata: importing the packages
+    # would load lgpio's C extension and run w1thermsensor's kernel module setup
     for package, expected_version in required.items():
         try:
-            if package == 'lgpio':
-                import lgpio
-                version = lgpio.__version__ if hasattr(lgpio, '__version__') else '0.2.2.0'
-            elif package == 'click':
-                import click
-                version = click.__version__
-            elif package == 'w1thermsensor':
-                import w1thermsensor
-                version = w1thermsensor.__version__ if hasattr(w1thermsensor, '__version__') else '2.3.0'
-            
-            print(f"✓ {package}: {version}")
-        except ImportError:
-            print(f"✗ {package}: NOT INSTALLED")
-            all_ok = False
+            version = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            # Distro packages (e.g. apt's python3-lgpio) may ship no metadata
+            if importlib.util.find_spec(package) is None:
+                out.append(f"✗ {package}: NOT INSTALLED")
+                all_ok = False
+                continue
+            version = expected_version
+        
+        out.append(f"✓ {package}: {version}")
     
     return all_ok
 
 
-def check_source_paths():
-    """Check that all source codebase directories exist."""
-    print("\n" + "=" * 60)
-    print("Checking source codebase directories...")
-    print("=" * 60)
+def check_source_paths(out):
+    """Check that all source codebase directories exist. Report lines go to out."""
+    out.append("\n" + BAR)
+    out.append("Checking source codebase directories...")
+    out.append(BAR)
     
     base_dir = os.path.expanduser('~')
     
@@ -59,26 +74,33 @@ def check_source_paths():
         'raspi-relay-shopheater': 'Valve control (relays)'
     }
     
+    # One directory listing instead of a stat() per expected directory
+    try:
+        with os.scandir(base_dir) as entries:
+            found_dirs = {entry.name for entry in entries if entry.is_dir()}
+    except OSError:
+        found_dirs = set()
+    
     all_ok = True
     
     for dirname, description in required_dirs.items():
         path = os.path.join(base_dir, dirname)
-        if os.path.isdir(path):
-            print(f"✓ {dirname}: {path}")
-            print(f"  └─ {description}")
+        if dirname in found_dirs:
+            out.append(f"✓ {dirname}: {path}")
+            out.append(f"  └─ {description}")
         else:
-            print(f"✗ {dirname}: NOT FOUND")
-            print(f"  └─ Expected at: {path}")
+            out.append(f"✗ {dirname}: NOT FOUND")
+            out.append(f"  └─ Expected at: {path}")
             all_ok = False
     
     return all_ok
 
 
-def check_module_imports():
-    """Check that all source modules can be imported."""
-    print("\n" + "=" * 60)
-    print("Checking source module imports...")
-    print("=" * 60)
+def check_module_imports(out):
+    """Check that all source modules can be imported. Report lines go to out."""
+    out.append("\n" + BAR)
+    out.append("Checking source module imports...")
+    out.append(BAR)
     
     base_dir = os.path.expanduser('~')
     
@@ -89,64 +111,83 @@ def check_module_imports():
         ('raspi-relay-shopheater', 'relay_control', 'RelayController')
     ]
     
-    all_ok = True
+    # Extend sys.path before this check's probe pool starts, so every probe
+    # searches all four source directories
+    paths = dict.fromkeys(os.path.join(base_dir, dirname) for dirname, _, _ in modules_to_check)
+    existing = set(sys.path)
+    sys.path.extend(path for path in paths if path not in existing)
     
-    for dirname, module_name, class_name in modules_to_check:
-        path = os.path.join(base_dir, dirname)
-        
-        if path not in sys.path:
-            sys.path.append(path)
-        
+    def probe(module_name, class_name):
+        """Import one module; returns (class found, error message or None)."""
         try:
-            module = __import__(module_name)
-            if hasattr(module, class_name):
-                print(f"✓ {dirname}/{module_name}.py")
-                print(f"  └─ {class_name} class found")
-            else:
-                print(f"✗ {dirname}/{module_name}.py")
-                print(f"  └─ {class_name} class NOT FOUND")
-                all_ok = False
-        except ImportError as e:
-            print(f"✗ {dirname}/{module_name}.py")
-            print(f"  └─ Import error: {e}")
+            module = importlib.import_module(module_name)
+        except Exception as e:  # ImportError, or whatever the module raises at import
+            return False, str(e)
+        return hasattr(module, class_name), None
+    
+    with ThreadPoolExecutor(max_workers=len(modules_to_check)) as executor:
+        results = list(executor.map(probe, [m for _, m, _ in modules_to_check],
+                                    [c for _, _, c in modules_to_check]))
+    
+    all_ok = True
+    
+    for (dirname, module_name, class_name), (found, error) in zip(modules_to_check, results):
+        if error is not None:
+            out.append(f"✗ {dirname}/{module_name}.py")
+            out.append(f"  └─ Import error: {error}")
+            all_ok = False
+        elif found:
+            out.append(f"✓ {dirname}/{module_name}.py")
+            out.append(f"  └─ {class_name} class found")
+        else:
+            out.append(f"✗ {dirname}/{module_name}.py")
+            out.append(f"  └─ {class_name} class NOT FOUND")
             all_ok = False
     
     return all_ok
 
 
-def check_gpio_permissions():
-    """Check if user is in gpio group."""
-    print("\n" + "=" * 60)
-    print("Checking GPIO permissions...")
-    print("=" * 60)
-    
+@functools.lru_cache(maxsize=1)
+def _gpio_group():
+    """The 'gpio' group entry (raises KeyError if it does not exist)."""
     import grp
-    import os
+    return grp.getgrnam('gpio')
+
+
+@functools.lru_cache(maxsize=1)
+def _current_user():
+    """Login name; $USER is often unset under systemd or sudo -i, so fall back to the uid."""
+    import pwd
+    return os.getenv('USER') or pwd.getpwuid(os.getuid()).pw_name
+
+
+def check_gpio_permissions(out):
+    """Check if user is in gpio group. Report lines go to out."""
+    out.append("\n" + BAR)
+    out.append("Checking GPIO permissions...")
+    out.append(BAR)
     
     try:
-        gpio_group = grp.getgrnam('gpio')
-        username = os.getenv('USER')
+        gpio_group = _gpio_group()
+        username = _current_user()
         
         if username in gpio_group.gr_mem:
-            print(f"✓ User '{username}' is in 'gpio' group")
+            out.append(f"✓ User '{username}' is in 'gpio' group")
             return True
         else:
-            print(f"✗ User '{username}' is NOT in 'gpio' group")
-            print(f"  Run: sudo usermod -a -G gpio {username}")
-            print(f"  Then log out and back in")
+            out.append(f"✗ User '{username}' is NOT in 'gpio' group")
+            out.append(f"  Run: sudo usermod -a -G gpio {username}")
+            out.append(f"  Then log out and back in")
             return False
     except KeyError:
-        print("✗ 'gpio' group does not exist on this system")
+        out.append("✗ 'gpio' group does not exist on this system")
         return False
 
 
 def main():
     """Run all verification checks."""
-    print("\n")
-    print("╔" + "=" * 58 + "╗")
-    print("║" + " " * 15 + "SHOPHEATER3000 SETUP VERIFICATION" + " " * 10 + "║")
-    print("╚" + "=" * 58 + "╝")
-    print()
+    # Banner first, so something shows while the checks run
+    print(f"\n\n{BANNER}\n", flush=True)
     
     checks = [
         ("Installed Packages", check_packages),
@@ -155,42 +196,57 @@ def main():
         ("GPIO Permissions", check_gpio_permissions)
     ]
     
-    results = {}
-    
-    for check_name, check_func in checks:
+    def run_check(check_name, check_func):
+        out = []
         try:
-            results[check_name] = check_func()
+            passed = check_func(out)
         except Exception as e:
-            print(f"\n✗ Error during {check_name}: {e}")
-            results[check_name] = False
+            out.append(f"\n✗ Error during {check_name}: {e}")
+            passed = False
+        return passed, out
+    
+    # The checks are independent and mostly wait on the filesystem, so run
+    # them together; each one buffers its report, printed in the usual order
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [(check_name, executor.submit(run_check, check_name, check_func))
+                   for check_name, check_func in checks]
+    
+    # Collect the reports and the summary, then write them in one go
+    report = []
+    results = {}
+    for check_name, future in futures:
+        results[check_name], out = future.result()
+        report.extend(out)
     
     # Summary
-    print("\n" + "=" * 60)
-    print("VERIFICATION SUMMARY")
-    print("=" * 60)
+    report.append("\n" + BAR)
+    report.append("VERIFICATION SUMMARY")
+    report.append(BAR)
     
     all_passed = all(results.values())
     
     for check_name, passed in results.items():
         status = "✓ PASSED" if passed else "✗ FAILED"
-        print(f"{status}: {check_name}")
+        report.append(f"{status}: {check_name}")
     
-    print("=" * 60)
+    report.append(BAR)
     
     if all_passed:
-        print("\n✓ All checks passed! System is ready for integration.")
-        print("\nNext steps:")
-        print("  1. Test individual modules with hardware")
-        print("  2. Create your integration script")
-        print("  3. Test SHOPHEATER3000 with all modules together")
+        report.append("\n✓ All checks passed! System is ready for integration.")
+        report.append("\nNext steps:")
+        report.append("  1. Test individual modules with hardware")
+        report.append("  2. Create your integration script")
+        report.append("  3. Test SHOPHEATER3000 with all modules together")
     else:
-        print("\n✗ Some checks failed. Please fix the issues above.")
-        print("\nCommon fixes:")
-        print("  - Missing packages: pip install -r requirements.txt")
-        print("  - Missing directories: Verify source codebase locations")
-        print("  - GPIO permissions: sudo usermod -a -G gpio $USER")
+        report.append("\n✗ Some checks failed. Please fix the issues above.")
+        report.append("\nCommon fixes:")
+        report.append("  - Missing packages: pip install -r requirements.txt")
+        report.append("  - Missing directories: Verify source codebase locations")
+        report.append("  - GPIO permissions: sudo usermod -a -G gpio $USER")
     
-    print()
+    report.append("")
+    sys.stdout.write("\n".join(report) + "\n")
+    sys.stdout.flush()
     
     sys.exit(0 if all_passed else 1)
 